@@ -3,22 +3,43 @@
 from __future__ import annotations
 
 import argparse
+import codecs
 import csv
+import heapq
 import logging
+import os
 import re
+import statistics
+import sys
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Iterator
+from types import MappingProxyType
+from typing import AbstractSet, Any, Callable, Collection, Iterable, Iterator, Mapping, Sequence
 
 from .config import TARGET_POSTCODES, build_runtime_config
 from .export import export_leads
-from .integrations import build_drive_download_url, download_file, extract_zip_file, upload_csv_to_google_sheet
+from .integrations import (
+    build_drive_download_url,
+    download_file,
+    extract_zip_file,
+    file_sha256,
+    upload_csv_to_google_sheet,
+)
 from .transform import bucket_from_nace
 from .validate import validate_record
 
 LOGGER = logging.getLogger(__name__)
 LARGE_CSV_WARNING_BYTES = 1_000_000_000
+LOADER_WORKERS = 4
+CSV_READ_BUFFER_BYTES = 1 << 22
+ENCODING_SNIFF_BYTES = 1 << 16
+EXTRACT_MANIFEST_NAME = ".manifest"
+
+# Shared read-only fallback for enterprises without contact rows.
+_EMPTY_CONTACT: Mapping[str, str] = MappingProxyType({"phone": "", "email": "", "website": "", "has_website": "no"})
 
 INPUT_FILE_CANDIDATES: dict[str, list[str]] = {
     "enterprise": ["enterprises.csv", "enterprise.csv"],
@@ -30,7 +51,7 @@ INPUT_FILE_CANDIDATES: dict[str, list[str]] = {
 }
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Lead Radar CSV pipeline")
     parser.add_argument("--input", required=True, help="Input map met bron-CSV's")
     parser.add_argument("--output", required=True, help="Output CSV pad")
@@ -66,12 +87,17 @@ def parse_args() -> argparse.Namespace:
         help="Google Sheet URL om output naar tabblad te pushen (vereist GOOGLE_SERVICE_ACCOUNT_JSON)",
     )
     parser.add_argument("--sheet-tab", default="Leads", help="Google Sheet tabbladnaam voor upload")
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Controleer elk record met validate_record (standaard uit)",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Valideer input en toon preview zonder outputbestand te schrijven",
     )
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def resolve_input_dir(args: argparse.Namespace) -> Path:
@@ -80,7 +106,8 @@ def resolve_input_dir(args: argparse.Namespace) -> Path:
     Returns the path to the extracted Drive ZIP directory when
     ``--input-drive-zip`` is provided and download/extract succeeds.
     Falls back to ``--input`` when Drive handling raises ``OSError`` and the
-    local input directory exists.
+    local input directory exists. Extraction is skipped when the manifest in
+    the extracted directory records the SHA-256 of the downloaded ZIP.
     """
     if not args.input_drive_zip:
         return Path(args.input)
@@ -92,7 +119,13 @@ def resolve_input_dir(args: argparse.Namespace) -> Path:
     download_url = build_drive_download_url(args.input_drive_zip)
     try:
         download_file(download_url, zip_path)
-        extract_zip_file(zip_path, extracted_dir)
+        zip_digest = file_sha256(zip_path)
+        manifest_path = extracted_dir / EXTRACT_MANIFEST_NAME
+        if not manifest_path.is_file() or manifest_path.read_text(encoding="utf-8").strip() != zip_digest:
+            # Without a manifest a half-extracted directory is never reused.
+            manifest_path.unlink(missing_ok=True)
+            extract_zip_file(zip_path, extracted_dir)
+            manifest_path.write_text(f"{zip_digest}\n", encoding="utf-8")
         return extracted_dir
     except OSError as err:
         fallback_input = Path(args.input)
@@ -102,18 +135,56 @@ def resolve_input_dir(args: argparse.Namespace) -> Path:
         raise
 
 
-def detect_delimiter(path: Path, fallback: str = ";") -> str:
-    with path.open("r", encoding="utf-8-sig", errors="ignore", newline="") as handle:
-        sample = handle.read(4_096)
+def detect_delimiter(path: Path, fallback: str = ";", *, sample_bytes: int = 8192) -> str:
+    """Pick the delimiter that occurs in the header and has the most consistent count per line."""
+    with path.open("rb") as handle:
+        sample = handle.read(sample_bytes)
 
-    if not sample:
+    lines = sample.split(b"\n")
+    if len(sample) == sample_bytes and len(lines) > 1:
+        lines.pop()  # the last line may be cut off
+    lines = [line for line in lines if line.strip()]
+    if not lines:
         return fallback
 
+    best: float | None = None
+    selected = fallback
+    # Same preference order as csv.Sniffer: on equally consistent counts, "," beats tab beats ";".
+    for delimiter in (",", "\t", ";"):
+        needle = delimiter.encode()
+        if needle not in lines[0]:
+            continue
+        score = statistics.pstdev([line.count(needle) for line in lines])
+        if best is None or score < best:
+            best = score
+            selected = delimiter
+    return selected
+
+
+def _detect_encoding(path: Path, preferred: str) -> str:
+    """Return ``preferred`` if the file prefix decodes with it, otherwise latin-1."""
+    if preferred.lower() == "latin-1":
+        return preferred
     try:
-        dialect = csv.Sniffer().sniff(sample, delimiters=";,\t")
-        return str(dialect.delimiter)
-    except csv.Error:
-        return fallback
+        with path.open("rb") as handle:
+            prefix = handle.read(ENCODING_SNIFF_BYTES)
+        # final=False: a multibyte character cut off at the end of the sample is not an error.
+        codecs.getincrementaldecoder(preferred)(errors="strict").decode(prefix, final=False)
+    except UnicodeDecodeError:
+        return "latin-1"
+    except (LookupError, OSError):
+        pass
+    return preferred
+
+
+def _advise_sequential_read(handle: Any) -> None:
+    """Hint sequential read-ahead to the kernel; a no-op where posix_fadvise is unavailable."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except OSError:
+        pass
 
 
 def iter_csv_rows(path: Path, *, encoding: str = "utf-8-sig", max_bad_lines: int = 1000) -> Iterator[dict[str, str]]:
@@ -125,16 +196,19 @@ def iter_csv_rows(path: Path, *, encoding: str = "utf-8-sig", max_bad_lines: int
     except (csv.Error, OSError):
         delimiter = ";"
 
+    is_large = False
     try:
         file_size = path.stat().st_size
         if file_size >= LARGE_CSV_WARNING_BYTES:
+            is_large = True
             size_gb = file_size / (1024**3)
             LOGGER.warning("Large CSV detected for streaming: %s (%.2f GiB)", path, size_gb)
     except OSError:
         pass
 
-    encodings = [encoding]
-    if encoding.lower() != "latin-1":
+    detected_encoding = _detect_encoding(path, encoding)
+    encodings = [detected_encoding]
+    if detected_encoding.lower() != "latin-1":
         encodings.append("latin-1")
 
     last_decode_error: UnicodeDecodeError | None = None
@@ -142,7 +216,11 @@ def iter_csv_rows(path: Path, *, encoding: str = "utf-8-sig", max_bad_lines: int
         bad_lines = 0
         line_index = 1
         try:
-            with path.open("r", encoding=selected_encoding, errors="strict", newline="") as handle:
+            with path.open(
+                "r", encoding=selected_encoding, errors="strict", newline="", buffering=CSV_READ_BUFFER_BYTES
+            ) as handle:
+                if is_large:
+                    _advise_sequential_read(handle)
                 reader = csv.DictReader(handle, delimiter=delimiter)
                 try:
                     for line_index, row in enumerate(reader, start=2):
@@ -164,8 +242,8 @@ def iter_csv_rows(path: Path, *, encoding: str = "utf-8-sig", max_bad_lines: int
 
                     for fallback_line_index, line in enumerate(handle, start=line_index + 1):
                         try:
-                            parsed_rows = list(csv.reader([line], delimiter=delimiter))
-                        except (OSError, csv.Error) as parse_error:
+                            values = next(csv.reader((line,), delimiter=delimiter), None)
+                        except csv.Error as parse_error:
                             bad_lines += 1
                             LOGGER.warning(
                                 "Skipping bad line %s in %s: %s",
@@ -179,14 +257,13 @@ def iter_csv_rows(path: Path, *, encoding: str = "utf-8-sig", max_bad_lines: int
                                 ) from parse_error
                             continue
 
-                        if not parsed_rows:
+                        if values is None:
                             bad_lines += 1
                             LOGGER.warning("Skipping empty/bad line %s in %s", fallback_line_index, path)
                             if bad_lines > max_bad_lines:
                                 raise RuntimeError(f"Max bad lines exceeded ({max_bad_lines}) while reading {path}")
                             continue
 
-                        values = parsed_rows[0]
                         if len(values) != len(fieldnames):
                             bad_lines += 1
                             LOGGER.warning(
@@ -220,24 +297,74 @@ def iter_csv_rows(path: Path, *, encoding: str = "utf-8-sig", max_bad_lines: int
 
 
 def read_csv(path: Path, *, encoding: str = "utf-8-sig", max_bad_lines: int = 1000) -> list[dict[str, str]]:
+    """Read a whole file into a list; prefer ``iter_csv_rows`` for large files."""
     return list(iter_csv_rows(path, encoding=encoding, max_bad_lines=max_bad_lines))
 
 
+_KEY_ALIASES = {
+    "zipcode": "postal_code",
+    "municipalitynl": "city",
+    "municipalityfr": "city_fr",
+    "streetnl": "street",
+    "housenumber": "house_number",
+}
+
+_NON_KEY_CHARS_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_key_slow(name: str) -> str:
+    value = str(name)
+    if not value.isascii():
+        value = unicodedata.normalize("NFKD", value)
+        value = "".join(ch for ch in value if not unicodedata.combining(ch))
+    normalized = _NON_KEY_CHARS_PATTERN.sub("_", value.strip().lower()).strip("_")
+    return _KEY_ALIASES.get(normalized, normalized)
+
+
+_KBO_HEADER_KEYS = {
+    header: sys.intern(_normalize_key_slow(header))
+    for header in (
+        "EnterpriseNumber",
+        "Status",
+        "JuridicalSituation",
+        "TypeOfEnterprise",
+        "JuridicalForm",
+        "JuridicalFormCAC",
+        "StartDate",
+        "EstablishmentNumber",
+        "EntityNumber",
+        "TypeOfAddress",
+        "CountryNL",
+        "CountryFR",
+        "Zipcode",
+        "MunicipalityNL",
+        "MunicipalityFR",
+        "StreetNL",
+        "StreetFR",
+        "HouseNumber",
+        "Box",
+        "ExtraAddressInfo",
+        "DateStrikingOff",
+        "EntityContact",
+        "ContactType",
+        "Value",
+        "Language",
+        "TypeOfDenomination",
+        "Denomination",
+        "ActivityGroup",
+        "NaceVersion",
+        "NaceCode",
+        "Classification",
+    )
+}
+
+
 def normalize_key(name: str) -> str:
-    value = unicodedata.normalize("NFKD", str(name))
-    value = "".join(ch for ch in value if not unicodedata.combining(ch))
-    value = re.sub(r"[^a-z0-9]+", "_", value.strip().lower())
-    value = re.sub(r"_+", "_", value)
-    normalized = value.strip("_")
-
-    aliases = {
-        "zipcode": "postal_code",
-        "municipalitynl": "city",
-        "municipalityfr": "city_fr",
-        "streetnl": "street",
-        "housenumber": "house_number",
-    }
-    return aliases.get(normalized, normalized)
+    known = _KBO_HEADER_KEYS.get(name)
+    if known is not None:
+        return known
+    return _normalize_key_slow(name)
 
 
 def normalize_row_keys(row: dict[str, str]) -> dict[str, str]:
@@ -247,15 +374,33 @@ def normalize_row_keys(row: dict[str, str]) -> dict[str, str]:
 def iter_csv_rows_normalized(
     path: Path,
     *,
+    keep_column: Callable[[str], bool] | None = None,
     encoding: str = "utf-8-sig",
     max_bad_lines: int = 1000,
 ) -> Iterator[dict[str, str]]:
+    """Stream rows with normalized keys; ``keep_column`` limits rows to the requested columns."""
+    normalized_keys: dict[str, str | None] = {}
     for row in iter_csv_rows(path, encoding=encoding, max_bad_lines=max_bad_lines):
-        yield normalize_row_keys(row)
+        try:
+            yield {name: value for key, value in row.items() if (name := normalized_keys[key]) is not None}
+        except KeyError:
+            for key in row:
+                if key not in normalized_keys:
+                    name = sys.intern(normalize_key(key))
+                    normalized_keys[key] = name if keep_column is None or keep_column(name) else None
+            yield {name: value for key, value in row.items() if (name := normalized_keys[key]) is not None}
+
+
+_ID_SEPARATORS = str.maketrans("", "", ". \"'")
+_NON_DIGIT_PATTERN = re.compile(r"\D")
 
 
 def normalize_identifier(value: str) -> str:
-    return re.sub(r"\D", "", str(value or "").strip().strip('"').strip("'"))
+    # KBO numbers only use dots, spaces or quotes as separators ("2.123.456.789").
+    compact = str(value or "").strip().translate(_ID_SEPARATORS)
+    if not compact.isdecimal():
+        compact = _NON_DIGIT_PATTERN.sub("", compact)
+    return sys.intern(compact)
 
 
 def normalize_id(value: str | None) -> str:
@@ -263,14 +408,24 @@ def normalize_id(value: str | None) -> str:
     return normalize_identifier(value or "")
 
 
-def _first_non_empty(row: dict[str, str], candidates: list[str]) -> str:
+def _first_non_empty(row: Mapping[str, Any], candidates: Sequence[str]) -> str:
     for key in candidates:
-        value = str(row.get(key, "") or "").strip()
+        value = row.get(key)
         if value:
-            return value
+            value = str(value).strip()
+            if value:
+                return value
     return ""
 
 
+def _resolve_field_candidates(
+    columns: Collection[str],
+    field_candidates: Mapping[str, Sequence[str]],
+) -> dict[str, tuple[str, ...]]:
+    """Limit each field's candidate columns to those present in the header row."""
+    return {field: tuple(key for key in candidates if key in columns) for field, candidates in field_candidates.items()}
+
+
 def _find_by_keywords(row: dict[str, str], keywords: list[str]) -> str:
     for key, value in row.items():
         lowered = key.lower()
@@ -320,45 +475,40 @@ def _build_address(establishment: dict[str, str]) -> tuple[str, str, str]:
     return address, postal_code, city
 
 
-def _map_enterprise_row(raw_row: dict[str, str]) -> dict[str, str]:
-    row = raw_row
-    enterprise_number = normalize_id(_first_non_empty(row, ["enterprise_number", "enterprisenumber", "entity_number"]))
-    name = _first_non_empty(
-        row,
-        [
-            "name",
-            "denomination",
-            "denomination_nl",
-            "denomination_fr",
-            "legal_name",
-            "tradename",
-        ],
-    )
-    status = _first_non_empty(row, ["status", "enterprise_status"])
-    start_date = _first_non_empty(row, ["start_date", "startdate", "creation_date"])
-    postal_code = _first_non_empty(row, ["postal_code", "postcode", "post_code"])
-    city = _first_non_empty(row, ["city", "municipality", "municipality_nl", "municipality_fr"])
-    address = _first_non_empty(row, ["address", "street", "street_name"])
-    website = _first_non_empty(row, ["website", "web", "url"])
+_ENTERPRISE_FIELD_CANDIDATES: dict[str, tuple[str, ...]] = {
+    "enterprise_number": ("enterprise_number", "enterprisenumber", "entity_number"),
+    "name": ("name", "denomination", "denomination_nl", "denomination_fr", "legal_name", "tradename"),
+    "status": ("status", "enterprise_status"),
+    "start_date": ("start_date", "startdate", "creation_date"),
+    "postal_code": ("postal_code", "postcode", "post_code"),
+    "city": ("city", "municipality", "municipality_nl", "municipality_fr"),
+    "address": ("address", "street", "street_name"),
+    "website": ("website", "web", "url"),
+}
 
-    return {
-        "enterprise_number": enterprise_number,
-        "name": name,
-        "status": status,
-        "start_date": start_date,
-        "postal_code": postal_code,
-        "city": city,
-        "address": address,
-        "website": website,
-    }
+
+def _map_enterprise_row(
+    raw_row: dict[str, str],
+    field_candidates: Mapping[str, Sequence[str]] = _ENTERPRISE_FIELD_CANDIDATES,
+) -> dict[str, str]:
+    enterprise = {field: _first_non_empty(raw_row, candidates) for field, candidates in field_candidates.items()}
+    enterprise["enterprise_number"] = normalize_id(enterprise["enterprise_number"])
+    return enterprise
+
+
+_ESTABLISHMENT_ID_CANDIDATES: dict[str, tuple[str, ...]] = {
+    "enterprise_number": ("enterprise_number", "enterprisenumber", "entity_number"),
+    "establishment_number": ("establishment_number", "establishmentnumber", "entity_number"),
+}
 
 
-def _map_establishment_row(raw_row: dict[str, str]) -> dict[str, str]:
+def _map_establishment_row(
+    raw_row: dict[str, str],
+    id_candidates: Mapping[str, Sequence[str]] = _ESTABLISHMENT_ID_CANDIDATES,
+) -> dict[str, str]:
     row = raw_row
-    enterprise_number = normalize_id(_first_non_empty(row, ["enterprise_number", "enterprisenumber", "entity_number"]))
-    establishment_number = normalize_id(
-        _first_non_empty(row, ["establishment_number", "establishmentnumber", "entity_number"])
-    )
+    enterprise_number = normalize_id(_first_non_empty(row, id_candidates["enterprise_number"]))
+    establishment_number = normalize_id(_first_non_empty(row, id_candidates["establishment_number"]))
     address, postal_code, city = _build_address(row)
 
     if not address:
@@ -376,14 +526,26 @@ def _map_establishment_row(raw_row: dict[str, str]) -> dict[str, str]:
 def _load_enterprises(
     input_dir: Path,
     *,
+    max_months: int | None = None,
     encoding: str = "utf-8-sig",
     max_bad_lines: int = 1000,
 ) -> list[dict[str, str]]:
+    """Load enterprises; with ``max_months``, inactive or too old enterprises are dropped while reading."""
     enterprises_file = find_input_file(input_dir, INPUT_FILE_CANDIDATES["enterprise"])
-    return [
-        _map_enterprise_row(row)
-        for row in iter_csv_rows_normalized(enterprises_file, encoding=encoding, max_bad_lines=max_bad_lines)
-    ]
+    enterprises: list[dict[str, str]] = []
+    field_candidates: dict[str, tuple[str, ...]] | None = None
+    for row in iter_csv_rows_normalized(enterprises_file, encoding=encoding, max_bad_lines=max_bad_lines):
+        if field_candidates is None:
+            field_candidates = _resolve_field_candidates(row, _ENTERPRISE_FIELD_CANDIDATES)
+        enterprise = _map_enterprise_row(row, field_candidates)
+        if max_months is not None:
+            if enterprise["status"].upper() not in _ACTIVE_STATUS_CODES:
+                continue
+            age_months = months_since(enterprise.get("start_date", ""))
+            if age_months is None or age_months > max_months:
+                continue
+        enterprises.append(enterprise)
+    return enterprises
 
 
 def _load_establishments(
@@ -393,10 +555,35 @@ def _load_establishments(
     max_bad_lines: int = 1000,
 ) -> list[dict[str, str]]:
     establishments_file = find_input_file(input_dir, INPUT_FILE_CANDIDATES["establishment"])
-    return [
-        _map_establishment_row(row)
-        for row in iter_csv_rows_normalized(establishments_file, encoding=encoding, max_bad_lines=max_bad_lines)
-    ]
+    establishments: list[dict[str, str]] = []
+    id_candidates: dict[str, tuple[str, ...]] | None = None
+    for row in iter_csv_rows_normalized(establishments_file, encoding=encoding, max_bad_lines=max_bad_lines):
+        if id_candidates is None:
+            id_candidates = _resolve_field_candidates(row, _ESTABLISHMENT_ID_CANDIDATES)
+        establishments.append(_map_establishment_row(row, id_candidates))
+    return establishments
+
+
+# Every key _build_address or the establishment lookup can read contains one of these fragments.
+_ADDRESS_COLUMN_FRAGMENTS = (
+    "establishment",
+    "entity",
+    "street",
+    "house",
+    "number",
+    "box",
+    "bus",
+    "post",
+    "zip",
+    "municipality",
+    "city",
+    "commune",
+    "address",
+)
+
+
+def _is_address_column(name: str) -> bool:
+    return any(fragment in name for fragment in _ADDRESS_COLUMN_FRAGMENTS)
 
 
 def load_addresses_by_establishment(
@@ -411,8 +598,12 @@ def load_addresses_by_establishment(
         return {}
 
     addresses_by_establishment: dict[str, dict[str, str]] = {}
-    for row in iter_csv_rows(address_file, encoding=encoding, max_bad_lines=max_bad_lines):
-        normalized_row = normalize_row_keys(row)
+    for normalized_row in iter_csv_rows_normalized(
+        address_file,
+        keep_column=_is_address_column,
+        encoding=encoding,
+        max_bad_lines=max_bad_lines,
+    ):
         establishment_number = normalize_id(
             _first_non_empty(
                 normalized_row,
@@ -441,6 +632,30 @@ def load_addresses_by_establishment(
     return addresses_by_establishment
 
 
+def _load_activities_by_enterprise(
+    input_dir: Path,
+    *,
+    enterprise_ids: set[str] | None = None,
+    encoding: str = "utf-8-sig",
+    max_bad_lines: int = 1000,
+) -> dict[str, list[str]]:
+    activity_file = find_input_file(input_dir, INPUT_FILE_CANDIDATES["activity"])
+    activities_by_enterprise: dict[str, list[str]] = {}
+    for normalized_row in iter_csv_rows_normalized(activity_file, encoding=encoding, max_bad_lines=max_bad_lines):
+        enterprise_number = normalize_id(
+            normalized_row.get("enterprise_number")
+            or normalized_row.get("enterprisenumber")
+            or normalized_row.get("entity_number")
+            or ""
+        )
+        if enterprise_ids is not None and enterprise_number not in enterprise_ids:
+            continue
+        nace_code = (normalized_row.get("nace_code") or "").strip()
+        if enterprise_number and nace_code:
+            activities_by_enterprise.setdefault(enterprise_number, []).append(nace_code)
+    return activities_by_enterprise
+
+
 def _debug_postcode_diagnostics(postcode_samples: list[dict[str, Any]], *, verbose: bool) -> None:
     if not verbose:
         return
@@ -467,31 +682,43 @@ def _debug_postcode_diagnostics(postcode_samples: list[dict[str, Any]], *, verbo
     print(f"Verbose postcode diagnostics sample (first {len(sample_preview)}): {sample_preview}")
 
 
+_STATUS_ALIASES = {"AC": "ACTIVE", "IN": "INACTIVE"}
+_ACTIVE_STATUS_CODES = frozenset({"AC", "ACTIVE"})
+
+
 def normalize_status(value: str) -> str:
-    mapping = {"AC": "ACTIVE", "IN": "INACTIVE"}
     cleaned = str(value or "").strip()
-    return mapping.get(cleaned.upper(), cleaned)
+    return _STATUS_ALIASES.get(cleaned.upper(), cleaned)
 
 
 def is_active_status(value: str) -> bool:
-    cleaned = str(value or "").strip().upper()
-    return cleaned == "AC" or normalize_status(cleaned) == "ACTIVE"
+    return str(value or "").strip().upper() in _ACTIVE_STATUS_CODES
 
 
 def find_input_file(input_dir: Path, candidates: list[str]) -> Path:
-    for candidate in candidates:
-        candidate_path = input_dir / candidate
-        if candidate_path.is_file():
-            return candidate_path
-
-    for candidate in candidates:
-        doubled_extension = input_dir / f"{candidate}.csv"
-        if doubled_extension.is_file():
-            return doubled_extension
+    files_by_name: dict[str, Path] = {}
+    files_by_lower_name: dict[str, Path] = {}
+    found_entries: list[str] = []
+    if input_dir.exists():
+        with os.scandir(input_dir) as entries:
+            for entry in entries:
+                found_entries.append(entry.name)
+                if entry.is_file():
+                    files_by_name[entry.name] = Path(entry.path)
+                    files_by_lower_name.setdefault(entry.name.lower(), Path(entry.path))
+
+    # Any exact name (including a doubled "x.csv.csv" extension) wins over a case-insensitive match.
+    names = [f"{candidate}{suffix}" for suffix in ("", ".csv") for candidate in candidates]
+    for name in names:
+        if name in files_by_name:
+            return files_by_name[name]
+    for name in names:
+        match = files_by_lower_name.get(name.lower())
+        if match is not None:
+            return match
 
-    found_entries = sorted(item.name for item in input_dir.iterdir()) if input_dir.exists() else []
     expected = ", ".join(candidates)
-    found = ", ".join(found_entries) if found_entries else "(geen bestanden gevonden)"
+    found = ", ".join(sorted(found_entries)) if found_entries else "(geen bestanden gevonden)"
     raise FileNotFoundError(
         f"Geen geldig inputbestand gevonden in '{input_dir}'. " f"Verwacht één van: {expected}. Gevonden: {found}."
     )
@@ -521,9 +748,26 @@ def detect_input_dir(input_dir: Path) -> Path:
     return input_dir
 
 
+# EntityContact values that point at an establishment instead of the enterprise itself.
+_ESTABLISHMENT_CONTACT_MARKERS = frozenset({"EST", "ESTABLISHMENT", "VESTIGING"})
+# KBO ContactType -> contact field; FAX is recognised but not exported.
+_CONTACT_FIELD_BY_TYPE: dict[str, str | None] = {"TEL": "phone", "EMAIL": "email", "WEB": "website", "FAX": None}
+
+
+def map_establishments_to_enterprises(establishments: Iterable[Mapping[str, str]]) -> dict[str, str]:
+    """Map establishment numbers to their enterprise number for establishment-level contact rows."""
+    establishment_to_enterprise: dict[str, str] = {}
+    for row in establishments:
+        establishment_number = normalize_id(row.get("establishment_number") or "")
+        enterprise_number = normalize_id(row.get("enterprise_number") or "")
+        if establishment_number and enterprise_number:
+            establishment_to_enterprise[establishment_number] = enterprise_number
+    return establishment_to_enterprise
+
+
 def load_contacts_by_enterprise(
     input_dir: Path,
-    establishments: list[dict[str, str]],
+    establishment_to_enterprise: Mapping[str, str],
     *,
     encoding: str = "utf-8-sig",
     max_bad_lines: int = 1000,
@@ -533,17 +777,8 @@ def load_contacts_by_enterprise(
     except FileNotFoundError:
         return {}
 
-    establishment_to_enterprise: dict[str, str] = {}
-    for row in establishments:
-        establishment_number = normalize_id(row.get("establishment_number") or "")
-        enterprise_number = normalize_id(row.get("enterprise_number") or "")
-        if establishment_number and enterprise_number:
-            establishment_to_enterprise[establishment_number] = enterprise_number
-
     contacts_by_enterprise: dict[str, dict[str, str]] = {}
-    for raw_row in iter_csv_rows(contacts_file, encoding=encoding, max_bad_lines=max_bad_lines):
-        row = normalize_row_keys(raw_row)
-
+    for row in iter_csv_rows_normalized(contacts_file, encoding=encoding, max_bad_lines=max_bad_lines):
         entity_number = normalize_id(
             row.get("entitynumber")
             or row.get("entity_number")
@@ -552,11 +787,9 @@ def load_contacts_by_enterprise(
             or ""
         )
         entity_contact = (row.get("entitycontact") or row.get("entity_contact") or "").strip().upper()
-        contact_type = (row.get("contacttype") or row.get("contact_type") or "").strip().upper()
 
         enterprise_number = ""
-        is_establishment = entity_contact in {"EST", "ESTABLISHMENT", "VESTIGING"}
-        if is_establishment:
+        if entity_contact in _ESTABLISHMENT_CONTACT_MARKERS:
             enterprise_number = establishment_to_enterprise.get(entity_number, "")
         else:
             enterprise_number = entity_number
@@ -564,20 +797,26 @@ def load_contacts_by_enterprise(
         if not enterprise_number:
             continue
 
-        existing = contacts_by_enterprise.get(
-            enterprise_number,
-            {"phone": "", "email": "", "website": "", "has_website": "no"},
-        )
+        contact_type = (row.get("contacttype") or row.get("contact_type") or "").strip().upper()
+
+        existing = contacts_by_enterprise.get(enterprise_number)
+        if existing is None:
+            existing = contacts_by_enterprise[enterprise_number] = {
+                "phone": "",
+                "email": "",
+                "website": "",
+                "has_website": "no",
+            }
 
-        if contact_type in {"TEL", "EMAIL", "WEB", "FAX"}:
+        if contact_type in _CONTACT_FIELD_BY_TYPE:
+            field = _CONTACT_FIELD_BY_TYPE[contact_type]
+            if field is None or existing[field]:
+                continue
             contact_value = (row.get("value") or "").strip()
-            if contact_type == "TEL" and contact_value and not existing["phone"]:
-                existing["phone"] = contact_value
-            if contact_type == "EMAIL" and contact_value and not existing["email"]:
-                existing["email"] = contact_value
-            if contact_type == "WEB" and contact_value and not existing["website"]:
-                existing["website"] = contact_value
-                existing["has_website"] = "yes"
+            if contact_value:
+                existing[field] = contact_value
+                if field == "website":
+                    existing["has_website"] = "yes"
         else:
             phone_value = (row.get("phone") or "").strip()
             email_value = (row.get("email") or "").strip()
@@ -590,11 +829,16 @@ def load_contacts_by_enterprise(
                 existing["website"] = website_value
                 existing["has_website"] = "yes"
 
-        contacts_by_enterprise[enterprise_number] = existing
-
     return contacts_by_enterprise
 
 
+# Prefer legal denominations (001). For ties, prefer Dutch/French/English and first seen.
+_DENOMINATION_LANGUAGE_PRIORITY = {"nl": 0, "n": 0, "fr": 1, "f": 1, "en": 2, "e": 2, "de": 3, "d": 3}
+_DEFAULT_DENOMINATION_LANGUAGE_RANK = 4
+_DENOMINATION_TYPE_PRIORITY = {"001": 0, "1": 0, "002": 1, "2": 1}
+_DEFAULT_DENOMINATION_TYPE_RANK = 2
+
+
 def load_denominations_by_enterprise(
     input_dir: Path,
     *,
@@ -606,47 +850,31 @@ def load_denominations_by_enterprise(
     except FileNotFoundError:
         return {}
 
-    # Prefer legal denominations (001). For ties, prefer Dutch/French/English and first seen.
-    language_priority = {
-        "nl": 0,
-        "n": 0,
-        "fr": 1,
-        "f": 1,
-        "en": 2,
-        "e": 2,
-        "de": 3,
-        "d": 3,
-    }
-    default_language_rank = 4
-    default_type_rank = 2
-    type_priority = {"001": 0, "1": 0, "002": 1, "2": 1}
-
-    selected: dict[str, tuple[int, int, int, str]] = {}
-    for index, raw_row in enumerate(iter_csv_rows(denomination_file, encoding=encoding, max_bad_lines=max_bad_lines)):
-        row = normalize_row_keys(raw_row)
-
+    selected: dict[str, tuple[int, int, str]] = {}
+    for row in iter_csv_rows_normalized(denomination_file, encoding=encoding, max_bad_lines=max_bad_lines):
         enterprise_number = normalize_id(
             row.get("entity_number") or row.get("enterprise_number") or row.get("entitynumber") or ""
         )
+        if not enterprise_number:
+            continue
+        previous = selected.get(enterprise_number)
+        if previous is not None and previous[0] == 0 and previous[1] == 0:
+            # A Dutch legal name cannot be beaten by later rows.
+            continue
+
         denomination = (row.get("denomination") or row.get("name") or "").strip()
-        if not enterprise_number or not denomination:
+        if not denomination:
             continue
 
         denomination_type = (row.get("type_of_denomination") or row.get("typeofdenomination") or "").strip()
         language = (row.get("language") or row.get("language_code") or row.get("lang") or "").strip().lower()
+        type_rank = _DENOMINATION_TYPE_PRIORITY.get(denomination_type, _DEFAULT_DENOMINATION_TYPE_RANK)
+        language_rank = _DENOMINATION_LANGUAGE_PRIORITY.get(language, _DEFAULT_DENOMINATION_LANGUAGE_RANK)
 
-        ranking = (
-            type_priority.get(denomination_type, default_type_rank),
-            language_priority.get(language, default_language_rank),
-            index,
-            denomination,
-        )
-
-        previous = selected.get(enterprise_number)
-        if previous is None or ranking < previous:
-            selected[enterprise_number] = ranking
+        if previous is None or (type_rank, language_rank) < (previous[0], previous[1]):
+            selected[enterprise_number] = (type_rank, language_rank, denomination)
 
-    return {enterprise_number: ranked[3] for enterprise_number, ranked in selected.items()}
+    return {enterprise_number: ranked[2] for enterprise_number, ranked in selected.items()}
 
 
 def months_since(start_date: str) -> int | None:
@@ -657,6 +885,7 @@ def months_since(start_date: str) -> int | None:
     return (today.year - started.year) * 12 + (today.month - started.month)
 
 
+@lru_cache(maxsize=65_536)
 def parse_date(date_str: str | None) -> date | None:
     if date_str is None:
         return None
@@ -665,6 +894,20 @@ def parse_date(date_str: str | None) -> date | None:
     if not cleaned or cleaned in {"0", "0000-00-00", "00-00-0000", "0000/00/00"}:
         return None
 
+    # ISO (2026-01-31) and KBO (31-01-2026) dates have fixed field positions.
+    if len(cleaned) == 10 and cleaned[:2].isdigit() and cleaned[8:].isdigit():
+        if cleaned[4] == "-" and cleaned[7] == "-" and cleaned[2:4].isdigit() and cleaned[5:7].isdigit():
+            year, month, day = cleaned[:4], cleaned[5:7], cleaned[8:]
+        elif cleaned[2] == cleaned[5] and cleaned[2] in "-/" and cleaned[3:5].isdigit() and cleaned[6:8].isdigit():
+            year, month, day = cleaned[6:], cleaned[3:5], cleaned[:2]
+        else:
+            year = ""
+        if year:
+            try:
+                return date(int(year), int(month), int(day))
+            except ValueError:
+                return None
+
     for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y"):
         try:
             return datetime.strptime(cleaned, fmt).date()
@@ -673,11 +916,14 @@ def parse_date(date_str: str | None) -> date | None:
     return None
 
 
-def parse_postcodes(raw: str) -> set[str]:
-    parsed = {normalized for item in raw.split(",") if (normalized := normalize_postal_code(item))}
+def parse_postcodes(raw: str) -> frozenset[str]:
+    parsed = frozenset(normalized for item in raw.split(",") if (normalized := normalize_postal_code(item)))
     if parsed:
         return parsed
-    return set(TARGET_POSTCODES)
+    return frozenset(TARGET_POSTCODES)
+
+
+_POSTCODE_IN_TEXT_PATTERN = re.compile(r"\b(\d{4})\b")
 
 
 def normalize_postal_code(value: str | None) -> str:
@@ -685,10 +931,10 @@ def normalize_postal_code(value: str | None) -> str:
     if not cleaned:
         return ""
 
-    if re.fullmatch(r"\d{4}", cleaned):
+    if len(cleaned) == 4 and cleaned.isdecimal():
         return cleaned
 
-    match = re.search(r"\b(\d{4})\b", cleaned)
+    match = _POSTCODE_IN_TEXT_PATTERN.search(cleaned)
     if match:
         return match.group(1)
 
@@ -709,6 +955,78 @@ def _get_postcode(row: dict[str, Any]) -> str:
     return normalize_postal_code(str(value))
 
 
+def index_establishments_by_enterprise(
+    establishments: Iterable[dict[str, str]],
+    addresses_by_establishment: Mapping[str, Mapping[str, str]] | None = None,
+) -> dict[str, dict[str, str]]:
+    """Pick one establishment per enterprise in a single hash-join pass.
+
+    An establishment with a postcode beats one without; on a tie, one with an
+    address wins. Otherwise the first establishment seen is kept. When
+    ``addresses_by_establishment`` is given, its address data first fills the
+    empty address fields of each establishment (in place), so the ranking sees
+    the merged row.
+    """
+    establishment_by_enterprise: dict[str, dict[str, str]] = {}
+    for row in establishments:
+        if addresses_by_establishment and not (row.get("address") and row.get("postal_code") and row.get("city")):
+            address_data = addresses_by_establishment.get(normalize_id(row.get("establishment_number", "")))
+            if address_data:
+                row["address"] = row.get("address") or address_data.get("address", "")
+                row["postal_code"] = row.get("postal_code") or address_data.get("postal_code", "")
+                row["city"] = row.get("city") or address_data.get("city", "")
+
+        enterprise_number = normalize_id(row.get("enterprise_number", ""))
+        if not enterprise_number:
+            continue
+
+        existing = establishment_by_enterprise.get(enterprise_number)
+        if not existing:
+            establishment_by_enterprise[enterprise_number] = row
+            continue
+
+        existing_has_postcode = bool(_get_postcode(existing))
+        candidate_has_postcode = bool(_get_postcode(row))
+        if candidate_has_postcode and not existing_has_postcode:
+            establishment_by_enterprise[enterprise_number] = row
+            continue
+
+        if candidate_has_postcode == existing_has_postcode:
+            existing_has_address = bool((existing.get("address") or "").strip())
+            candidate_has_address = bool((row.get("address") or "").strip())
+            if candidate_has_address and not existing_has_address:
+                establishment_by_enterprise[enterprise_number] = row
+
+    return establishment_by_enterprise
+
+
+# One bit per score reason; bit order is the order reasons are reported in.
+SCORE_REASON_LABELS: tuple[str, ...] = ("new<18m", "sector_high", "no_nace", "has_phone", "has_email", "has_website")
+SCORE_REASON_POINTS: tuple[int, ...] = (30, 15, -5, 5, 3, 0)
+REASON_NEW, REASON_SECTOR_HIGH, REASON_NO_NACE, REASON_HAS_PHONE, REASON_HAS_EMAIL, REASON_HAS_WEBSITE = (
+    1 << index for index in range(len(SCORE_REASON_LABELS))
+)
+HIGH_SCORE_SECTORS = frozenset({"beauty", "horeca", "health"})
+
+
+@lru_cache(maxsize=None)
+def format_score_reasons(bits: int) -> str:
+    """Render a reason bitmask as the ``|``-joined string used in the output."""
+    return "|".join(label for index, label in enumerate(SCORE_REASON_LABELS) if bits >> index & 1)
+
+
+def _build_score_table() -> tuple[tuple[int, str], ...]:
+    table = []
+    for bits in range(1 << len(SCORE_REASON_LABELS)):
+        points = sum(weight for index, weight in enumerate(SCORE_REASON_POINTS) if bits >> index & 1)
+        table.append((max(0, min(100, points)), format_score_reasons(bits)))
+    return tuple(table)
+
+
+# (score, reasons) for every reason combination; score_record is a bitmask lookup into it.
+_SCORE_TABLE = _build_score_table()
+
+
 def score_record(
     age_months: int | None,
     sector_bucket: str,
@@ -718,39 +1036,73 @@ def score_record(
     has_website: bool,
     max_months: int,
 ) -> tuple[int, str]:
-    score = 0
-    reasons: list[str] = []
-
-    if age_months is not None and age_months <= max_months:
-        score += 30
-        reasons.append("new<18m")
+    bits = (
+        (REASON_NEW if age_months is not None and age_months <= max_months else 0)
+        | (REASON_SECTOR_HIGH if sector_bucket in HIGH_SCORE_SECTORS else 0)
+        | (0 if has_nace else REASON_NO_NACE)
+        | (REASON_HAS_PHONE if has_phone else 0)
+        | (REASON_HAS_EMAIL if has_email else 0)
+        | (REASON_HAS_WEBSITE if has_website else 0)
+    )
+    return _SCORE_TABLE[bits]
 
-    if sector_bucket in {"beauty", "horeca", "health"}:
-        score += 15
-        reasons.append("sector_high")
 
-    if not has_nace:
-        score -= 5
-        reasons.append("no_nace")
+@lru_cache(maxsize=None)
+def lite_score_reasons(has_phone: bool, has_email: bool, has_website: bool) -> str:
+    """Reasons for --lite records, which are not scored: ``lite_mode`` plus the contact flags."""
+    bits = (
+        (REASON_HAS_PHONE if has_phone else 0)
+        | (REASON_HAS_EMAIL if has_email else 0)
+        | (REASON_HAS_WEBSITE if has_website else 0)
+    )
+    return "|".join(filter(None, ("lite_mode", format_score_reasons(bits))))
 
-    if has_phone:
-        score += 5
-        reasons.append("has_phone")
 
-    if has_email:
-        score += 3
-        reasons.append("has_email")
+def _candidate_enterprises(
+    enterprises: Iterable[dict[str, str]],
+    establishment_by_enterprise: Mapping[str, dict[str, str]],
+    *,
+    selected_postcodes: AbstractSet[str],
+    max_months: int,
+) -> list[dict[str, str]]:
+    """Enterprises (in input order) that pass the active, age and postcode filters of build_records."""
+    candidates: list[dict[str, str]] = []
+    for enterprise in enterprises:
+        if not is_active_status(enterprise.get("status", "")):
+            continue
+        age_months = months_since(enterprise.get("start_date", ""))
+        if age_months is None or age_months > max_months:
+            continue
+        if selected_postcodes:
+            est = establishment_by_enterprise.get(normalize_id(enterprise.get("enterprise_number", "")), {})
+            raw_postcode = est.get("postal_code")
+            # A four-character hit is already canonical; only other values need normalize_postal_code.
+            if not (raw_postcode and len(raw_postcode) == 4 and raw_postcode in selected_postcodes):
+                if (_get_postcode(est) or _get_postcode(enterprise)) not in selected_postcodes:
+                    continue
+        candidates.append(enterprise)
+    return candidates
+
+
+def _push_top_scoring(
+    heap: list[tuple[int, int, dict[str, Any]]], record: dict[str, Any], *, limit: int, order: int
+) -> None:
+    """Keep the ``limit`` highest-scoring records; on equal scores the lowest ``order`` wins."""
+    entry = (int(record["score_total"]), -order, record)
+    if len(heap) < limit:
+        heapq.heappush(heap, entry)
+    else:
+        heapq.heappushpop(heap, entry)
 
-    if has_website:
-        reasons.append("has_website")
 
-    score = max(0, min(100, score))
-    return score, "|".join(reasons)
+def _drain_top_scoring(heap: list[tuple[int, int, dict[str, Any]]]) -> list[dict[str, Any]]:
+    """Records from the heap, highest score first, in the same order as export_leads' stable sort."""
+    return [entry[2] for entry in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
 
 
 def build_records(
     input_dir: Path,
-    selected_postcodes: set[str],
+    selected_postcodes: AbstractSet[str],
     max_months: int,
     *,
     min_score: int = 0,
@@ -759,27 +1111,35 @@ def build_records(
     lite: bool = False,
     city: str = "",
     query: str = "",
+    validate: bool = True,
 ) -> list[dict[str, Any]]:
     resolved_input_dir = detect_input_dir(input_dir)
     if verbose:
         print(_format_detected_files(resolved_input_dir))
 
-    enterprises = _load_enterprises(resolved_input_dir)
-    establishments = _load_establishments(resolved_input_dir)
-    addresses_by_establishment = load_addresses_by_establishment(resolved_input_dir)
-    for establishment in establishments:
-        establishment_number = normalize_id(establishment.get("establishment_number", ""))
-        if not establishment_number:
-            continue
-        address_data = addresses_by_establishment.get(establishment_number)
-        if not address_data:
-            continue
-        establishment["address"] = establishment.get("address") or address_data.get("address", "")
-        establishment["postal_code"] = establishment.get("postal_code") or address_data.get("postal_code", "")
-        establishment["city"] = establishment.get("city") or address_data.get("city", "")
+    with ThreadPoolExecutor(max_workers=LOADER_WORKERS) as pool:
+        # Verbose counters report every filter stage, so only non-verbose runs filter while reading.
+        enterprises_future = pool.submit(
+            _load_enterprises,
+            resolved_input_dir,
+            max_months=None if verbose else max_months,
+        )
+        establishments_future = pool.submit(_load_establishments, resolved_input_dir)
+        addresses_future = pool.submit(load_addresses_by_establishment, resolved_input_dir)
+        denominations_future = pool.submit(load_denominations_by_enterprise, resolved_input_dir)
+        contacts_future = pool.submit(
+            lambda: load_contacts_by_enterprise(
+                resolved_input_dir, map_establishments_to_enterprises(establishments_future.result())
+            )
+        )
+        enterprises = enterprises_future.result()
+        establishments = establishments_future.result()
+        addresses_by_establishment = addresses_future.result()
 
-    contacts_by_enterprise = load_contacts_by_enterprise(resolved_input_dir, establishments)
-    denominations_by_enterprise = load_denominations_by_enterprise(resolved_input_dir)
+        establishment_by_enterprise = index_establishments_by_enterprise(establishments, addresses_by_establishment)
+
+        denominations_by_enterprise = denominations_future.result()
+        contacts_by_enterprise = contacts_future.result()
 
     if verbose:
         print(
@@ -787,66 +1147,54 @@ def build_records(
             f"establishments={len(establishments)}, contacts={len(contacts_by_enterprise)}"
         )
 
-    establishment_by_enterprise: dict[str, dict[str, str]] = {}
-    for row in establishments:
-        enterprise_number = normalize_id(row.get("enterprise_number", ""))
-        if not enterprise_number:
-            continue
-
-        existing = establishment_by_enterprise.get(enterprise_number)
-        if not existing:
-            establishment_by_enterprise[enterprise_number] = row
-            continue
-
-        existing_has_postcode = bool(_get_postcode(existing))
-        candidate_has_postcode = bool(_get_postcode(row))
-        if candidate_has_postcode and not existing_has_postcode:
-            establishment_by_enterprise[enterprise_number] = row
-            continue
-
-        if candidate_has_postcode == existing_has_postcode:
-            existing_has_address = bool((existing.get("address") or "").strip())
-            candidate_has_address = bool((row.get("address") or "").strip())
-            if candidate_has_address and not existing_has_address:
-                establishment_by_enterprise[enterprise_number] = row
-
+    candidate_enterprises = _candidate_enterprises(
+        enterprises,
+        establishment_by_enterprise,
+        selected_postcodes=selected_postcodes,
+        max_months=max_months,
+    )
     activities_by_enterprise: dict[str, list[str]] = {}
     if not lite:
-        activity_file = find_input_file(resolved_input_dir, INPUT_FILE_CANDIDATES["activity"])
-        for row in iter_csv_rows(activity_file):
-            normalized_row = normalize_row_keys(row)
-            enterprise_number = normalize_id(
-                normalized_row.get("enterprise_number")
-                or normalized_row.get("enterprisenumber")
-                or normalized_row.get("entity_number")
-                or ""
-            )
-            nace_code = (normalized_row.get("nace_code") or "").strip()
-            if enterprise_number and nace_code:
-                activities_by_enterprise.setdefault(enterprise_number, []).append(nace_code)
+        activities_by_enterprise = _load_activities_by_enterprise(
+            resolved_input_dir,
+            enterprise_ids={
+                normalize_id(enterprise.get("enterprise_number", "")) for enterprise in candidate_enterprises
+            },
+        )
 
     source_version = resolved_input_dir.name
     records: list[dict[str, Any]] = []
+    # With --limit, keep only the best `limit` records in a bounded heap instead of the first `limit` seen.
+    top_k = limit if limit is not None and limit > 0 else 0
+    top_scoring: list[tuple[int, int, dict[str, Any]]] = []
+    kept_count = 0
+    city_lower = city.lower()
     active_enterprises_kept = 0
     join_with_establishment_kept = 0
     join_with_contact_kept = 0
     postcode_filter_kept = 0
+    with_establishment = 0
+    with_contact = 0
     postcode_samples: list[dict[str, Any]] = []
 
-    for enterprise in enterprises:
-        if not is_active_status(enterprise.get("status", "")):
+    for enterprise in enterprises if verbose else candidate_enterprises:
+        enterprise_number = normalize_id(enterprise.get("enterprise_number", ""))
+        est = establishment_by_enterprise.get(enterprise_number, {})
+        has_contact = bool(contacts_by_enterprise.get(enterprise_number))
+        if verbose:
+            with_establishment += bool(est)
+            with_contact += has_contact
+
+        status = str(enterprise.get("status") or "").strip()
+        status_code = status.upper()
+        if status_code not in _ACTIVE_STATUS_CODES:
             continue
         active_enterprises_kept += 1
 
-        enterprise_number = normalize_id(enterprise.get("enterprise_number", ""))
-        est = establishment_by_enterprise.get(enterprise_number, {})
         if est:
             join_with_establishment_kept += 1
-        contact = contacts_by_enterprise.get(
-            enterprise_number,
-            {"phone": "", "email": "", "website": "", "has_website": "no"},
-        )
-        if contacts_by_enterprise.get(enterprise_number):
+        contact = contacts_by_enterprise.get(enterprise_number, _EMPTY_CONTACT)
+        if has_contact:
             join_with_contact_kept += 1
 
         est_postal_code = _get_postcode(est)
@@ -864,7 +1212,7 @@ def build_records(
                     "est_keys": sorted(est.keys())[:12],
                 }
             )
-        start_date = enterprise.get("start_date", "").strip()
+        start_date = enterprise.get("start_date", "")
         if not start_date:
             continue
 
@@ -879,21 +1227,14 @@ def build_records(
         nace_codes = activities_by_enterprise.get(enterprise_number, []) if not lite else []
         first_nace_code = nace_codes[0] if nace_codes else None
         sector_bucket = bucket_from_nace(first_nace_code) if not lite else ""
-        website = contact["website"] or (enterprise.get("website") or "").strip()
+        website = contact["website"] or enterprise.get("website") or ""
         has_website = bool(website)
         phone = contact["phone"]
         email = contact["email"]
 
         if lite:
             score_total = 0
-            lite_reasons = ["lite_mode"]
-            if phone:
-                lite_reasons.append("has_phone")
-            if email:
-                lite_reasons.append("has_email")
-            if has_website:
-                lite_reasons.append("has_website")
-            score_reasons = "|".join(lite_reasons)
+            score_reasons = lite_score_reasons(bool(phone), bool(email), has_website)
         else:
             score_total, score_reasons = score_record(
                 age_months=age_months,
@@ -905,20 +1246,18 @@ def build_records(
                 max_months=max_months,
             )
 
-        enterprise_name = (enterprise.get("name") or "").strip() or denominations_by_enterprise.get(
-            enterprise_number, ""
-        )
+        enterprise_name = enterprise.get("name") or denominations_by_enterprise.get(enterprise_number, "")
 
         record = {
             "enterprise_number": enterprise_number,
             "name": enterprise_name,
-            "status": normalize_status(enterprise.get("status", "")),
+            "status": sys.intern(_STATUS_ALIASES.get(status_code, status)),
             "start_date": start_date,
-            "address": (est.get("address") or enterprise.get("address") or "").strip(),
-            "postal_code": postal_code,
-            "city": (est.get("city") or enterprise.get("city") or "").strip(),
+            "address": est.get("address") or enterprise.get("address") or "",
+            "postal_code": sys.intern(postal_code),
+            "city": sys.intern(est.get("city") or enterprise.get("city") or ""),
             "nace_codes": ",".join(nace_codes) if not lite else "",
-            "sector_bucket": sector_bucket,
+            "sector_bucket": sys.intern(sector_bucket),
             "has_website": "yes" if has_website else "no",
             "website": website,
             "phone": phone,
@@ -927,17 +1266,22 @@ def build_records(
             "score_reasons": score_reasons,
             "source_files_version": source_version,
         }
-        if city and city.lower() not in (record["city"] or "").lower():
+        if city_lower and city_lower not in record["city"].lower():
             continue
-        haystack = f"{record['name']} {record['sector_bucket']}".lower()
-        if query and query not in haystack:
+        if query and query not in f"{record['name']} {record['sector_bucket']}".lower():
             continue
         if int(record["score_total"]) < min_score:
             continue
-        validate_record(record)
-        records.append(record)
-        if limit is not None and limit > 0 and len(records) >= limit:
-            break
+        if validate:
+            validate_record(record)
+        if top_k:
+            _push_top_scoring(top_scoring, record, limit=top_k, order=kept_count)
+            kept_count += 1
+        else:
+            records.append(record)
+
+    if top_k:
+        records = _drain_top_scoring(top_scoring)
 
     if verbose and enterprises:
         print(f"Verbose counters: enterprises loaded={len(enterprises)}")
@@ -947,12 +1291,6 @@ def build_records(
         print(f"Verbose counters: after postcode filter={postcode_filter_kept}")
         _debug_postcode_diagnostics(postcode_samples, verbose=verbose)
 
-        with_establishment = sum(
-            1 for enterprise in enterprises if establishment_by_enterprise.get(enterprise["enterprise_number"])
-        )
-        with_contact = sum(
-            1 for enterprise in enterprises if contacts_by_enterprise.get(enterprise["enterprise_number"])
-        )
         establishment_ratio = (with_establishment / len(enterprises)) * 100
         contact_ratio = (with_contact / len(enterprises)) * 100
         print(
@@ -977,8 +1315,9 @@ def build_records(
     return records
 
 
-def main() -> None:
-    args = parse_args()
+def main(argv: Sequence[str] | None = None) -> None:
+    """CLI entry point; ``argv`` defaults to ``sys.argv[1:]``."""
+    args = parse_args(argv)
     try:
         runtime = build_runtime_config(args)
     except ValueError as err:
@@ -999,6 +1338,7 @@ def main() -> None:
             verbose=args.verbose,
             lite=args.lite,
             chunksize=args.chunksize,
+            validate=args.validate,
         )
         if runtime.city or runtime.query:
             lowered_city = runtime.city.lower()
@@ -1022,6 +1362,7 @@ def main() -> None:
             lite=args.lite,
             city=runtime.city,
             query=runtime.query,
+            validate=args.validate,
         )
     total_records = len(records)
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import argparse
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -59,29 +60,30 @@ class RuntimeConfig:
     dry_run: bool
 
 
-def build_runtime_config(args: object) -> RuntimeConfig:
-    country = str(getattr(args, "country", "BE") or "BE").upper()
+def build_runtime_config(args: argparse.Namespace) -> RuntimeConfig:
+    """Valideer de argumenten van ``cli.parse_args``; alle attributen staan daar met een default gedefinieerd."""
+    country = (args.country or "BE").upper()
     if country not in SUPPORTED_COUNTRIES:
         supported = ", ".join(sorted(SUPPORTED_COUNTRIES))
         raise ValueError(f"Unsupported --country '{country}'. Supported countries: {supported}.")
 
-    months = int(getattr(args, "months", 18))
+    months = int(args.months)
     if months < 1:
         raise ValueError("--months must be >= 1")
 
-    limit = int(getattr(args, "limit", 200))
+    limit = int(args.limit)
     if limit < 0:
         raise ValueError("--limit must be >= 0")
 
-    min_score = int(getattr(args, "min_score", 40))
+    min_score = int(args.min_score)
     if min_score < 0 or min_score > 100:
         raise ValueError("--min-score must be between 0 and 100")
 
-    input_dir = Path(str(getattr(args, "input", "") or ""))
+    input_dir = Path(args.input or "")
     if not input_dir.exists():
         raise ValueError(f"Input directory does not exist: {input_dir}")
 
-    output = Path(str(getattr(args, "output", "") or ""))
+    output = Path(args.output or "")
     if not output.name:
         raise ValueError("--output must include a filename, e.g. data/processed/leads.csv")
 
@@ -89,11 +91,11 @@ def build_runtime_config(args: object) -> RuntimeConfig:
         input_dir=input_dir,
         output=output,
         country=country,
-        city=str(getattr(args, "city", "") or "").strip(),
-        query=str(getattr(args, "query", "") or "").strip().lower(),
-        postcodes=str(getattr(args, "postcodes", "") or "").strip(),
+        city=(args.city or "").strip(),
+        query=(args.query or "").strip().lower(),
+        postcodes=(args.postcodes or "").strip(),
         months=months,
         min_score=min_score,
         limit=limit,
-        dry_run=bool(getattr(args, "dry_run", False)),
+        dry_run=bool(args.dry_run),
     )
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import csv
 from collections import Counter
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Iterable, Mapping
+from typing import Any, Iterable, Mapping, Sequence
 
 OUTPUT_COLUMNS = [
     "enterprise_number",
@@ -26,6 +27,21 @@ OUTPUT_COLUMNS = [
     "source_files_version",
 ]
 
+EXPORT_BUFFER_BYTES = 1 << 20
+
+_OUTPUT_VALUES = itemgetter(*OUTPUT_COLUMNS)
+
+
+def _row_values(row: Mapping[str, Any]) -> Sequence[Any]:
+    try:
+        return _OUTPUT_VALUES(row)
+    except KeyError:
+        return [row.get(column, "") for column in OUTPUT_COLUMNS]
+
+
+def _score_key(row: Mapping[str, Any]) -> int:
+    return int(row.get("score_total", 0))
+
 
 def export_leads(
     output_path: Path,
@@ -33,14 +49,13 @@ def export_leads(
     total_records: int,
 ) -> int:
     """Schrijf UTF-8 CSV, sorteer op score en print een korte summary."""
-    prepared = sorted(records, key=lambda row: int(row.get("score_total", 0)), reverse=True)
+    prepared = sorted(records, key=_score_key, reverse=True)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with output_path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=OUTPUT_COLUMNS)
-        writer.writeheader()
-        for row in prepared:
-            writer.writerow({column: row.get(column, "") for column in OUTPUT_COLUMNS})
+    with output_path.open("w", encoding="utf-8", newline="", buffering=EXPORT_BUFFER_BYTES) as handle:
+        writer = csv.writer(handle)
+        writer.writerow(OUTPUT_COLUMNS)
+        writer.writerows(_row_values(row) for row in prepared)
 
     print(f"Aantal records totaal: {total_records}")
     print(f"Aantal na filters: {len(prepared)}")
@@ -2,27 +2,34 @@
 
 from __future__ import annotations
 
+import sys
 from pathlib import Path
 from time import perf_counter
-from typing import Any, Iterator
+from typing import AbstractSet, Any, Iterator
 
 from .cli import (
+    _ACTIVE_STATUS_CODES,
+    _EMPTY_CONTACT,
+    _STATUS_ALIASES,
     INPUT_FILE_CANDIDATES,
     _debug_postcode_diagnostics,
+    _drain_top_scoring,
     _get_postcode,
     _map_enterprise_row,
     _map_establishment_row,
+    _push_top_scoring,
     build_records,
     detect_input_dir,
     find_input_file,
-    is_active_status,
+    index_establishments_by_enterprise,
+    lite_score_reasons,
     load_contacts_by_enterprise,
     load_denominations_by_enterprise,
+    map_establishments_to_enterprises,
     months_since,
     normalize_id,
     normalize_key,
     normalize_postal_code,
-    normalize_status,
     score_record,
 )
 from .transform import bucket_from_nace
@@ -164,6 +171,7 @@ def _iter_csv_chunks(path: Path, *, chunksize: int, usecols: list[str] | None =
                 keep_default_na=False,
                 encoding=encoding,
                 usecols=usecols,
+                memory_map=True,
             )
             return
         except UnicodeDecodeError:
@@ -176,44 +184,74 @@ def _iter_csv_chunks(path: Path, *, chunksize: int, usecols: list[str] | None =
                 chunksize=chunksize,
                 keep_default_na=False,
                 encoding=encoding,
+                memory_map=True,
             )
             return
 
 
 def _normalize_chunk_columns(chunk):
-    return chunk.rename(columns={column: normalize_key(str(column)) for column in chunk.columns})
+    chunk.columns = [normalize_key(str(column)) for column in chunk.columns]
+    return chunk
 
 
 def _first_present_column(chunk, candidates: list[str]) -> str | None:
+    present = set(chunk.columns)
     for candidate in candidates:
-        if candidate in chunk.columns:
+        if candidate in present:
             return candidate
     return None
 
 
+def _normalize_id_column(series):
+    """Vectorized ``normalize_id``: keep only the digits of every value."""
+    return series.str.replace(r"\D+", "", regex=True)
+
+
+def _isin_values(values: AbstractSet[str]):
+    """Build an ``isin`` lookup once per file instead of per chunk."""
+    pd = _import_pandas()
+    return pd.Index(list(values), dtype=object)
+
+
+def _postcode_mask(series, postcodes_set: AbstractSet[str]):
+    """Boolean mask for rows whose normalized postcode is in *postcodes_set*.
+
+    Postcodes are heavily repeated, so the column is factorized first and
+    ``normalize_postal_code`` only runs once per distinct raw value.
+    """
+    pd = _import_pandas()
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    keep_by_code = [normalize_postal_code(value) in postcodes_set for value in uniques]
+    return pd.Series(keep_by_code, dtype=bool).to_numpy()[codes]
+
+
 def _scan_addresses_for_postcodes(
     addresses_file: Path,
-    postcodes_set: set[str],
+    postcodes_set: AbstractSet[str],
     chunksize: int,
 ) -> tuple[set[str], dict[str, dict[str, str]], int]:
     establishment_ids: set[str] = set()
     addresses_by_establishment: dict[str, dict[str, str]] = {}
     scanned_rows = 0
 
+    resolved_columns: tuple[str | None, str | None] | None = None
     for chunk in _iter_csv_chunks(addresses_file, chunksize=chunksize, usecols=ADDRESS_USECOLS):
         chunk = _normalize_chunk_columns(chunk)
         scanned_rows += len(chunk)
 
-        postcode_col = _first_present_column(chunk, ["postal_code", "postcode", "post_code", "zip_code", "zip"])
-        establishment_col = _first_present_column(
-            chunk,
-            ["establishment_number", "establishmentnumber", "entity_number", "entitynumber"],
-        )
+        if resolved_columns is None:
+            resolved_columns = (
+                _first_present_column(chunk, ["postal_code", "postcode", "post_code", "zip_code", "zip"]),
+                _first_present_column(
+                    chunk,
+                    ["establishment_number", "establishmentnumber", "entity_number", "entitynumber"],
+                ),
+            )
+        postcode_col, establishment_col = resolved_columns
         if not postcode_col or not establishment_col:
-            continue
+            break
 
-        normalized_postcodes = chunk[postcode_col].map(normalize_postal_code)
-        filtered = chunk[normalized_postcodes.isin(postcodes_set)]
+        filtered = chunk[_postcode_mask(chunk[postcode_col], postcodes_set)]
         if filtered.empty:
             continue
 
@@ -244,19 +282,22 @@ def _scan_establishments(
     if not establishment_ids:
         return enterprise_ids, establishments_subset, scanned_rows
 
+    establishment_lookup = _isin_values(establishment_ids)
+    establishment_col: str | None = None
     for chunk in _iter_csv_chunks(establishments_file, chunksize=chunksize, usecols=ESTABLISHMENT_USECOLS):
         chunk = _normalize_chunk_columns(chunk)
         scanned_rows += len(chunk)
 
-        establishment_col = _first_present_column(
-            chunk,
-            ["establishment_number", "establishmentnumber", "entity_number"],
-        )
-        if not establishment_col:
-            continue
+        if establishment_col is None:
+            establishment_col = _first_present_column(
+                chunk,
+                ["establishment_number", "establishmentnumber", "entity_number"],
+            )
+            if not establishment_col:
+                break
 
-        normalized_establishments = chunk[establishment_col].map(normalize_id)
-        filtered = chunk[normalized_establishments.isin(establishment_ids)]
+        normalized_establishments = _normalize_id_column(chunk[establishment_col])
+        filtered = chunk[normalized_establishments.isin(establishment_lookup)]
         if filtered.empty:
             continue
 
@@ -276,14 +317,17 @@ def iter_enterprises_filtered(
     enterprise_ids_set: set[str],
     chunksize: int,
 ) -> Iterator[dict[str, str]]:
+    enterprise_lookup = _isin_values(enterprise_ids_set)
+    enterprise_col: str | None = None
     for chunk in _iter_csv_chunks(enterprises_file, chunksize=chunksize, usecols=ENTERPRISE_USECOLS):
         chunk = _normalize_chunk_columns(chunk)
-        enterprise_col = _first_present_column(chunk, ["enterprise_number", "enterprisenumber", "entity_number"])
-        if not enterprise_col:
-            continue
+        if enterprise_col is None:
+            enterprise_col = _first_present_column(chunk, ["enterprise_number", "enterprisenumber", "entity_number"])
+            if not enterprise_col:
+                return
 
-        normalized_ids = chunk[enterprise_col].map(normalize_id)
-        filtered = chunk[normalized_ids.isin(enterprise_ids_set)] if enterprise_ids_set else chunk
+        normalized_ids = _normalize_id_column(chunk[enterprise_col])
+        filtered = chunk[normalized_ids.isin(enterprise_lookup)] if enterprise_ids_set else chunk
         for row in filtered.to_dict(orient="records"):
             yield _map_enterprise_row(row)
 
@@ -297,15 +341,21 @@ def _load_activities_for_enterprises(
     if not enterprise_ids_set:
         return activities_by_enterprise
 
+    enterprise_lookup = _isin_values(enterprise_ids_set)
+    resolved_columns: tuple[str | None, str | None] | None = None
     for chunk in _iter_csv_chunks(activity_file, chunksize=chunksize, usecols=ACTIVITY_USECOLS):
         chunk = _normalize_chunk_columns(chunk)
-        enterprise_col = _first_present_column(chunk, ["enterprise_number", "enterprisenumber", "entity_number"])
-        nace_col = _first_present_column(chunk, ["nace_code", "nace", "activity_code"])
+        if resolved_columns is None:
+            resolved_columns = (
+                _first_present_column(chunk, ["enterprise_number", "enterprisenumber", "entity_number"]),
+                _first_present_column(chunk, ["nace_code", "nace", "activity_code"]),
+            )
+        enterprise_col, nace_col = resolved_columns
         if not enterprise_col or not nace_col:
-            continue
+            break
 
-        normalized_ids = chunk[enterprise_col].map(normalize_id)
-        filtered = chunk[normalized_ids.isin(enterprise_ids_set)]
+        normalized_ids = _normalize_id_column(chunk[enterprise_col])
+        filtered = chunk[normalized_ids.isin(enterprise_lookup)]
         if filtered.empty:
             continue
 
@@ -320,7 +370,7 @@ def _load_activities_for_enterprises(
 
 def build_records_fast(
     input_dir: Path,
-    selected_postcodes: set[str],
+    selected_postcodes: AbstractSet[str],
     max_months: int,
     *,
     min_score: int = 0,
@@ -328,6 +378,7 @@ def build_records_fast(
     verbose: bool = False,
     lite: bool = False,
     chunksize: int = 200_000,
+    validate: bool = True,
 ) -> list[dict[str, Any]]:
     if not selected_postcodes:
         return build_records(
@@ -338,6 +389,7 @@ def build_records_fast(
             limit=limit,
             verbose=verbose,
             lite=lite,
+            validate=validate,
         )
 
     resolved_input_dir = detect_input_dir(input_dir)
@@ -365,40 +417,12 @@ def build_records_fast(
     )
     t2 = perf_counter()
 
-    for establishment in establishments_subset:
-        establishment_number = normalize_id(establishment.get("establishment_number", ""))
-        if not establishment_number:
-            continue
-        address_data = addresses_by_establishment.get(establishment_number)
-        if not address_data:
-            continue
-        establishment["address"] = establishment.get("address") or address_data.get("address", "")
-        establishment["postal_code"] = establishment.get("postal_code") or address_data.get("postal_code", "")
-        establishment["city"] = establishment.get("city") or address_data.get("city", "")
-
-    contacts_by_enterprise = load_contacts_by_enterprise(resolved_input_dir, establishments_subset)
+    establishment_by_enterprise = index_establishments_by_enterprise(establishments_subset, addresses_by_establishment)
+    contacts_by_enterprise = load_contacts_by_enterprise(
+        resolved_input_dir, map_establishments_to_enterprises(establishments_subset)
+    )
     denominations_by_enterprise = load_denominations_by_enterprise(resolved_input_dir)
 
-    establishment_by_enterprise: dict[str, dict[str, str]] = {}
-    for row in establishments_subset:
-        enterprise_number = normalize_id(row.get("enterprise_number", ""))
-        if not enterprise_number:
-            continue
-        existing = establishment_by_enterprise.get(enterprise_number)
-        if not existing:
-            establishment_by_enterprise[enterprise_number] = row
-            continue
-        existing_has_postcode = bool(_get_postcode(existing))
-        candidate_has_postcode = bool(_get_postcode(row))
-        if candidate_has_postcode and not existing_has_postcode:
-            establishment_by_enterprise[enterprise_number] = row
-            continue
-        if candidate_has_postcode == existing_has_postcode:
-            existing_has_address = bool((existing.get("address") or "").strip())
-            candidate_has_address = bool((row.get("address") or "").strip())
-            if candidate_has_address and not existing_has_address:
-                establishment_by_enterprise[enterprise_number] = row
-
     activities_by_enterprise: dict[str, list[str]] = {}
     t3 = perf_counter()
     if not lite:
@@ -408,22 +432,24 @@ def build_records_fast(
 
     source_version = resolved_input_dir.name
     records: list[dict[str, Any]] = []
+    top_k = limit if limit is not None and limit > 0 else 0
+    top_scoring: list[tuple[int, int, dict[str, Any]]] = []
+    kept_count = 0
     postcode_samples: list[dict[str, Any]] = []
     enterprises_processed = 0
     active_enterprises_kept = 0
 
     for enterprise in iter_enterprises_filtered(enterprises_file, enterprise_ids, chunksize):
         enterprises_processed += 1
-        if not is_active_status(enterprise.get("status", "")):
+        status = str(enterprise.get("status") or "").strip()
+        status_code = status.upper()
+        if status_code not in _ACTIVE_STATUS_CODES:
             continue
         active_enterprises_kept += 1
 
         enterprise_number = normalize_id(enterprise.get("enterprise_number", ""))
         est = establishment_by_enterprise.get(enterprise_number, {})
-        contact = contacts_by_enterprise.get(
-            enterprise_number,
-            {"phone": "", "email": "", "website": "", "has_website": "no"},
-        )
+        contact = contacts_by_enterprise.get(enterprise_number, _EMPTY_CONTACT)
 
         est_postal_code = _get_postcode(est)
         enterprise_postal_code = _get_postcode(enterprise)
@@ -441,7 +467,7 @@ def build_records_fast(
                 }
             )
 
-        start_date = enterprise.get("start_date", "").strip()
+        start_date = enterprise.get("start_date", "")
         if not start_date:
             continue
 
@@ -454,21 +480,14 @@ def build_records_fast(
         nace_codes = activities_by_enterprise.get(enterprise_number, []) if not lite else []
         first_nace_code = nace_codes[0] if nace_codes else None
         sector_bucket = bucket_from_nace(first_nace_code) if not lite else ""
-        website = contact["website"] or (enterprise.get("website") or "").strip()
+        website = contact["website"] or enterprise.get("website") or ""
         has_website = bool(website)
         phone = contact["phone"]
         email = contact["email"]
 
         if lite:
             score_total = 0
-            lite_reasons = ["lite_mode"]
-            if phone:
-                lite_reasons.append("has_phone")
-            if email:
-                lite_reasons.append("has_email")
-            if has_website:
-                lite_reasons.append("has_website")
-            score_reasons = "|".join(lite_reasons)
+            score_reasons = lite_score_reasons(bool(phone), bool(email), has_website)
         else:
             score_total, score_reasons = score_record(
                 age_months=age_months,
@@ -480,20 +499,18 @@ def build_records_fast(
                 max_months=max_months,
             )
 
-        enterprise_name = (enterprise.get("name") or "").strip() or denominations_by_enterprise.get(
-            enterprise_number, ""
-        )
+        enterprise_name = enterprise.get("name") or denominations_by_enterprise.get(enterprise_number, "")
 
         record = {
             "enterprise_number": enterprise_number,
             "name": enterprise_name,
-            "status": normalize_status(enterprise.get("status", "")),
+            "status": sys.intern(_STATUS_ALIASES.get(status_code, status)),
             "start_date": start_date,
-            "address": (est.get("address") or enterprise.get("address") or "").strip(),
-            "postal_code": postal_code,
-            "city": (est.get("city") or enterprise.get("city") or "").strip(),
+            "address": est.get("address") or enterprise.get("address") or "",
+            "postal_code": sys.intern(postal_code),
+            "city": sys.intern(est.get("city") or enterprise.get("city") or ""),
             "nace_codes": ",".join(nace_codes) if not lite else "",
-            "sector_bucket": sector_bucket,
+            "sector_bucket": sys.intern(sector_bucket),
             "has_website": "yes" if has_website else "no",
             "website": website,
             "phone": phone,
@@ -504,10 +521,16 @@ def build_records_fast(
         }
         if int(record["score_total"]) < min_score:
             continue
-        validate_record(record)
-        records.append(record)
-        if limit is not None and limit > 0 and len(records) >= limit:
-            break
+        if validate:
+            validate_record(record)
+        if top_k:
+            _push_top_scoring(top_scoring, record, limit=top_k, order=kept_count)
+            kept_count += 1
+        else:
+            records.append(record)
+
+    if top_k:
+        records = _drain_top_scoring(top_scoring)
 
     t5 = perf_counter()
     if verbose:
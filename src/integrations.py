@@ -3,13 +3,22 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import os
 import re
+import shutil
 import zipfile
+from itertools import islice
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 from urllib.request import Request, urlopen
 
 _CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_BUFFER_BYTES = 8 * 1024 * 1024
+SHEETS_UPLOAD_BATCH_ROWS = 5000
+ZIP_EXTRACT_BUFFER_BYTES = 4 * 1024 * 1024
+_DRIVE_FILE_ID_PATTERN = re.compile(r"/file/d/([a-zA-Z0-9_-]+)")
+_SHEET_ID_PATTERN = re.compile(r"/spreadsheets/d/([a-zA-Z0-9-_]+)")
 
 
 def extract_google_drive_file_id(url: str) -> str:
@@ -18,7 +27,7 @@ def extract_google_drive_file_id(url: str) -> str:
     if parsed.netloc not in {"drive.google.com", "www.drive.google.com"}:
         raise ValueError("Not a Google Drive URL")
 
-    match = re.search(r"/file/d/([a-zA-Z0-9_-]+)", parsed.path)
+    match = _DRIVE_FILE_ID_PATTERN.search(parsed.path)
     if match:
         return match.group(1)
 
@@ -40,18 +49,52 @@ def download_file(url: str, destination: Path) -> Path:
     destination.parent.mkdir(parents=True, exist_ok=True)
     request = Request(url, headers={"User-Agent": "Mozilla/5.0"})
     with urlopen(request) as response, destination.open("wb") as output_handle:
-        while True:
-            chunk = response.read(_CHUNK_SIZE)
-            if not chunk:
-                break
-            output_handle.write(chunk)
+        shutil.copyfileobj(response, output_handle, length=DOWNLOAD_BUFFER_BYTES)
     return destination
 
 
+def file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UnsafeZipEntryError(OSError):
+    """A ZIP entry resolves outside the extraction directory (e.g. through a symlink)."""
+
+
+def _sanitize_member_name(filename: str) -> str:
+    """Drop drive letters, absolute roots and ``.``/``..`` parts, like ``ZipFile.extractall``."""
+    name = filename.replace("/", os.path.sep)
+    if os.path.altsep:
+        name = name.replace(os.path.altsep, os.path.sep)
+    name = os.path.splitdrive(name)[1]
+    return os.path.sep.join(
+        part for part in name.split(os.path.sep) if part not in ("", os.path.curdir, os.path.pardir)
+    )
+
+
 def extract_zip_file(zip_path: Path, output_dir: Path) -> Path:
+    """Extract every ZIP entry into output_dir; unsafe entry names are sanitized as by ``extractall``."""
     output_dir.mkdir(parents=True, exist_ok=True)
+    root = output_dir.resolve()
     with zipfile.ZipFile(zip_path, "r") as zip_handle:
-        zip_handle.extractall(output_dir)
+        for info in zip_handle.infolist():
+            name = _sanitize_member_name(info.filename)
+            if not name:
+                continue
+            target = (root / name).resolve()
+            if not target.is_relative_to(root):
+                raise UnsafeZipEntryError(f"Zip entry escapes output directory: {info.filename}")
+            if info.is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with zip_handle.open(info) as source, target.open("wb") as output_handle:
+                shutil.copyfileobj(source, output_handle, length=ZIP_EXTRACT_BUFFER_BYTES)
     return output_dir
 
 
@@ -60,7 +103,7 @@ def extract_google_sheet_id(url: str) -> str:
     if parsed.netloc not in {"docs.google.com", "www.docs.google.com"}:
         raise ValueError("Not a Google Sheets URL")
 
-    match = re.search(r"/spreadsheets/d/([a-zA-Z0-9-_]+)", parsed.path)
+    match = _SHEET_ID_PATTERN.search(parsed.path)
     if not match:
         raise ValueError("Unable to parse Google Sheet id")
     return match.group(1)
@@ -93,9 +136,20 @@ def upload_csv_to_google_sheet(*, sheet_url: str, csv_path: Path, worksheet_name
         worksheet = spreadsheet.add_worksheet(title=worksheet_name, rows=2000, cols=40)
 
     with csv_path.open("r", encoding="utf-8", newline="") as handle:
-        rows = list(csv.reader(handle))
+        row_count = 0
+        column_count = 0
+        for row in csv.reader(handle):
+            row_count += 1
+            column_count = max(column_count, len(row))
 
-    if not rows:
-        rows = [["no_data"]]
+    if not row_count:
+        worksheet.update("A1", [["no_data"]])
+        return
 
-    worksheet.update("A1", rows)
+    worksheet.resize(rows=row_count, cols=max(column_count, 1))
+    with csv_path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        start_row = 1
+        while batch := list(islice(reader, SHEETS_UPLOAD_BATCH_ROWS)):
+            worksheet.update(f"A{start_row}", batch)
+            start_row += len(batch)
@@ -50,12 +50,16 @@ DATASET_PATTERNS: dict[str, tuple[str, ...]] = {
 }
 
 
+# "_" is itself outside [a-z0-9], so this single substitution never leaves "__" behind.
+_NON_ALNUM_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
 def _normalize_name(name: str) -> str:
-    value = unicodedata.normalize("NFKD", str(name))
-    value = "".join(ch for ch in value if not unicodedata.combining(ch))
-    value = value.strip().lower()
-    value = re.sub(r"[^a-z0-9]+", "_", value)
-    value = re.sub(r"_+", "_", value)
+    value = str(name)
+    if not value.isascii():
+        value = unicodedata.normalize("NFKD", value)
+        value = "".join(ch for ch in value if not unicodedata.combining(ch))
+    value = _NON_ALNUM_PATTERN.sub("_", value.strip().lower())
     return value.strip("_")
 
 
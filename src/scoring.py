@@ -4,19 +4,17 @@ from __future__ import annotations
 
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
-from transform import bucket_from_nace, ensure_bucket
+from .transform import bucket_from_nace, ensure_bucket
 
-_SECTOR_BONUS_BUCKETS = {"beauty", "horeca", "health"}
+_SECTOR_BONUS_BUCKETS = frozenset({"beauty", "horeca", "health"})
 
 
-def _is_missing_value(value: object) -> bool:
-    if value is None:
-        return True
-    if pd.isna(value):
-        return True
-    return str(value).strip() == ""
+def _missing_mask(series: pd.Series) -> pd.Series:
+    """True where the value is missing: NaN/None or blank after stripping."""
+    return series.isna() | (series.astype(str).str.strip() == "")
 
 
 def score_leads(
@@ -24,6 +22,7 @@ def score_leads(
     *,
     months_recent: int = 18,
     today: datetime | None = None,
+    top_k: int | None = None,
 ) -> pd.DataFrame:
     """Apply rule-based scoring and return dataframe sorted by score descending.
 
@@ -33,7 +32,8 @@ def score_leads(
     - missing phone/email (if columns exist): +5 each
     - missing nace: -5
 
-    Adds ``score_total`` and ``score_reasons`` columns.
+    Adds ``score_total`` and ``score_reasons`` columns. With ``top_k`` only the
+    ``top_k`` best rows are returned (partial sort; ties keep input order).
     """
     scored = df.copy()
     now = pd.Timestamp(today or datetime.utcnow())
@@ -48,49 +48,30 @@ def score_leads(
     else:
         scored["sector"] = scored["sector"].apply(ensure_bucket)
 
-    totals: list[int] = []
-    reasons_col: list[str] = []
-
-    has_phone = "phone" in scored.columns
-    has_email = "email" in scored.columns
-    has_nace = "nace" in scored.columns
-
     parsed_start_dates = (
         pd.to_datetime(scored["start_date"], errors="coerce")
         if "start_date" in scored.columns
         else pd.Series(pd.NaT, index=scored.index)
     )
+    no_rows = pd.Series(False, index=scored.index)
+
+    rules = (
+        (parsed_start_dates >= recent_threshold, 30, f"new<{months_recent}m;+30"),
+        (scored["sector"].isin(_SECTOR_BONUS_BUCKETS), 15, "sector;+15"),
+        (_missing_mask(scored["phone"]) if "phone" in scored.columns else no_rows, 5, "missing_phone;+5"),
+        (_missing_mask(scored["email"]) if "email" in scored.columns else no_rows, 5, "missing_email;+5"),
+        (_missing_mask(scored["nace"]) if "nace" in scored.columns else no_rows, -5, "missing_nace;-5"),
+    )
 
-    for idx, row in scored.iterrows():
-        total = 0
-        reasons: list[str] = []
-
-        start_date = parsed_start_dates.loc[idx]
-        if pd.notna(start_date) and start_date >= recent_threshold:
-            total += 30
-            reasons.append(f"new<{months_recent}m;+30")
-
-        sector = row.get("sector", "other")
-        if sector in _SECTOR_BONUS_BUCKETS:
-            total += 15
-            reasons.append("sector;+15")
-
-        if has_phone and _is_missing_value(row.get("phone")):
-            total += 5
-            reasons.append("missing_phone;+5")
-
-        if has_email and _is_missing_value(row.get("email")):
-            total += 5
-            reasons.append("missing_email;+5")
-
-        if has_nace and _is_missing_value(row.get("nace")):
-            total -= 5
-            reasons.append("missing_nace;-5")
-
-        totals.append(total)
-        reasons_col.append("|".join(reasons))
+    totals = pd.Series(0, index=scored.index, dtype="int64")
+    reasons = pd.Series("", index=scored.index, dtype=object)
+    for mask, points, label in rules:
+        totals += mask.astype("int64") * points
+        reasons += np.where(mask, f"{label}|", "")
 
     scored["score_total"] = totals
-    scored["score_reasons"] = reasons_col
+    scored["score_reasons"] = reasons.str.rstrip("|")
 
+    if top_k:
+        return scored.nlargest(top_k, "score_total", keep="first")
     return scored.sort_values(by="score_total", ascending=False, kind="stable")
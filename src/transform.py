@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Optional
 
 # Rule-based NACE prefix mapping.
-# More specific prefixes must come before broader prefixes.
+# The longest matching prefix wins, so order within the table does not matter.
 _NACE_PREFIX_BUCKETS: tuple[tuple[str, str], ...] = (
     ("96.02", "beauty"),  # hair and beauty treatment
     ("56", "horeca"),
@@ -15,15 +16,19 @@ _NACE_PREFIX_BUCKETS: tuple[tuple[str, str], ...] = (
     ("81", "service_trades"),
     ("95", "service_trades"),
 )
+_NACE_BUCKET_BY_PREFIX: dict[str, str] = dict(_NACE_PREFIX_BUCKETS)
+_NACE_PREFIX_LENGTHS: tuple[int, ...] = tuple(sorted({len(prefix) for prefix in _NACE_BUCKET_BY_PREFIX}, reverse=True))
 
-_ALLOWED_BUCKETS = {
-    "beauty",
-    "horeca",
-    "health",
-    "retail",
-    "service_trades",
-    "other",
-}
+_ALLOWED_BUCKETS = frozenset(
+    {
+        "beauty",
+        "horeca",
+        "health",
+        "retail",
+        "service_trades",
+        "other",
+    }
+)
 
 
 def normalize_nace_code(nace_code: Optional[str]) -> str:
@@ -33,14 +38,22 @@ def normalize_nace_code(nace_code: Optional[str]) -> str:
     return str(nace_code).strip().upper().replace(",", ".")
 
 
+@lru_cache(maxsize=4096)
 def bucket_from_nace(nace_code: Optional[str]) -> str:
-    """Return one of: beauty, horeca, health, retail, service_trades, other."""
+    """Return one of: beauty, horeca, health, retail, service_trades, other.
+
+    Cached: a dump only holds a few thousand distinct NACE codes.
+    """
     normalized = normalize_nace_code(nace_code)
     if not normalized:
         return "other"
 
-    for prefix, bucket in _NACE_PREFIX_BUCKETS:
-        if normalized.startswith(prefix):
+    size = len(normalized)
+    for length in _NACE_PREFIX_LENGTHS:
+        if length > size:
+            continue
+        bucket = _NACE_BUCKET_BY_PREFIX.get(normalized[:length])
+        if bucket is not None:
             return bucket
 
     return "other"
@@ -48,7 +61,11 @@ def bucket_from_nace(nace_code: Optional[str]) -> str:
 
 def ensure_bucket(bucket: Optional[str]) -> str:
     """Ensure external bucket values remain in the supported list."""
-    value = (bucket or "").strip().lower()
+    if bucket in _ALLOWED_BUCKETS:
+        return bucket
+    if not bucket:
+        return "other"
+    value = bucket.strip().lower()
     if value in _ALLOWED_BUCKETS:
         return value
     return "other"
@@ -2,23 +2,33 @@
 
 from __future__ import annotations
 
-import re
 from typing import Any, Mapping
 
-POSTAL_CODE_PATTERN = re.compile(r"^\d{4}$")
 SCORE_MIN = 0
 SCORE_MAX = 100
 
 
+def _as_stripped_str(value: Any) -> str:
+    """Strip strings direct; andere waarden eerst via str()."""
+    return value.strip() if isinstance(value, str) else str(value).strip()
+
+
+def _is_postal_code(value: str) -> bool:
+    """Exact 4 decimale cijfers, dezelfde regel als ``\\d{4}`` in ``re`` (dus ook niet-ASCII cijfers)."""
+    return len(value) == 4 and value.isdecimal()
+
+
 def validate_record(record: Mapping[str, Any]) -> None:
     """Valideer vereiste velden voor exporteerbare records."""
-    enterprise_number = str(record.get("enterprise_number", "")).strip()
+    enterprise_number = _as_stripped_str(record.get("enterprise_number", ""))
     assert enterprise_number, "enterprise_number mag niet leeg zijn"
 
-    postal_code = str(record.get("postal_code", "")).strip()
-    assert POSTAL_CODE_PATTERN.fullmatch(postal_code), "postal_code moet exact 4 cijfers bevatten"
+    postal_code = _as_stripped_str(record.get("postal_code", ""))
+    assert _is_postal_code(postal_code), "postal_code moet exact 4 cijfers bevatten"
 
-    score_total = int(record.get("score_total", -1))
+    score_total = record.get("score_total", -1)
+    if type(score_total) is not int:
+        score_total = int(score_total)
     assert (
         SCORE_MIN <= score_total <= SCORE_MAX
     ), f"score_total ({score_total}) valt buiten verwacht bereik {SCORE_MIN}-{SCORE_MAX}"
@@ -1,6 +1,33 @@
 import sys
 from pathlib import Path
+from typing import Any
+
+import pytest
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="session")
+def sample_records() -> list[dict[str, Any]]:
+    """Records from data/sample, built once per test session. Treat as read-only."""
+    from src.cli import build_records
+    from src.config import TARGET_POSTCODES
+
+    return build_records(ROOT / "data" / "sample", selected_postcodes=set(TARGET_POSTCODES), max_months=18)
+
+
+@pytest.fixture(scope="session")
+def fixture_records() -> list[dict[str, Any]]:
+    """Default-pipeline records for tests/fixtures/minimal_kbo (postcode 9400), built once. Treat as read-only."""
+    from src.cli import build_records
+
+    fixture_input = ROOT / "tests" / "fixtures" / "minimal_kbo"
+    return build_records(fixture_input, selected_postcodes=frozenset({"9400"}), max_months=18)
+
+
+@pytest.fixture(scope="session")
+def cli_out_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Session-wide output directory for CLI runs; tests must use their own file names in it."""
+    return tmp_path_factory.mktemp("cli_out")
@@ -12,8 +12,8 @@ from src.export import export_leads
 ALLOWED_BUCKETS = {"beauty", "horeca", "health", "retail", "service_trades", "other"}
 
 
-def test_pipeline_runs_on_sample_and_writes_output(tmp_path: Path) -> None:
-    records = build_records(Path("data/sample"), selected_postcodes=set(TARGET_POSTCODES), max_months=18)
+def test_pipeline_runs_on_sample_and_writes_output(tmp_path: Path, sample_records: list[dict[str, Any]]) -> None:
+    records = sample_records
     assert records
     assert all(record["postal_code"] in TARGET_POSTCODES for record in records)
     assert all(record["sector_bucket"] in ALLOWED_BUCKETS for record in records)
@@ -33,6 +33,18 @@ def test_pipeline_runs_on_sample_and_writes_output(tmp_path: Path) -> None:
     assert "website" in content
 
 
+def test_export_leads_fills_missing_columns_with_empty_values(tmp_path: Path) -> None:
+    output_path = tmp_path / "partial.csv"
+
+    export_leads(output_path=output_path, records=[{"enterprise_number": "1", "score_total": 5}], total_records=1)
+
+    header, row = output_path.read_text(encoding="utf-8").splitlines()
+    values = dict(zip(header.split(","), row.split(",")))
+    assert values["enterprise_number"] == "1"
+    assert values["score_total"] == "5"
+    assert values["name"] == ""
+
+
 def test_read_csv_supports_comma_delimiter(tmp_path: Path) -> None:
     csv_path = tmp_path / "comma.csv"
     csv_path.write_text("enterprise_number,name\n1,Acme\n", encoding="utf-8")
@@ -43,6 +55,13 @@ def test_read_csv_supports_comma_delimiter(tmp_path: Path) -> None:
     assert rows == [{"enterprise_number": "1", "name": "Acme"}]
 
 
+def test_detect_delimiter_uses_header_line_only(tmp_path: Path) -> None:
+    csv_path = tmp_path / "semicolon.csv"
+    csv_path.write_text('enterprise_number;name\n1;"Acme, Beta, Gamma"\n', encoding="utf-8")
+
+    assert cli.detect_delimiter(csv_path) == ";"
+
+
 def test_find_input_file_accepts_singular_and_plural_names(tmp_path: Path) -> None:
     singular = tmp_path / "enterprise.csv"
     singular.write_text("enterprise_number;name\n1;Acme\n", encoding="utf-8")
@@ -59,6 +78,23 @@ def test_find_input_file_accepts_doubled_csv_extension(tmp_path: Path) -> None:
     assert found == doubled
 
 
+def test_find_input_file_ignores_filename_case(tmp_path: Path) -> None:
+    upper = tmp_path / "Enterprise.CSV"
+    upper.write_text("enterprise_number;name\n1;Acme\n", encoding="utf-8")
+
+    found = find_input_file(tmp_path, ["enterprises.csv", "enterprise.csv"])
+    assert found == upper
+
+
+def test_find_input_file_prefers_exact_name_over_case_insensitive_match(tmp_path: Path) -> None:
+    (tmp_path / "Enterprises.CSV").write_text("enterprise_number;name\n1;Acme\n", encoding="utf-8")
+    exact = tmp_path / "enterprise.csv"
+    exact.write_text("enterprise_number;name\n1;Acme\n", encoding="utf-8")
+
+    found = find_input_file(tmp_path, ["enterprises.csv", "enterprise.csv"])
+    assert found == exact
+
+
 def test_find_input_file_error_lists_expected_and_found(tmp_path: Path) -> None:
     (tmp_path / "unexpected.csv").write_text("id\n1\n", encoding="utf-8")
 
@@ -397,6 +433,43 @@ def test_iter_csv_rows_falls_back_to_line_by_line_on_stream_error(
     ]
 
 
+def test_iter_csv_rows_fallback_parses_each_line_on_its_own(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    csv_path = tmp_path / "stray_quotes.csv"
+    csv_path.write_text(
+        "enterprise_number;name\n" "1;Acme\n" '2;"Stray\n' "3;Bravo\n" "4;Broken;extra\n" '5;"Other\n' "6;Delta\n",
+        encoding="utf-8",
+    )
+
+    original_dict_reader = cli.csv.DictReader
+
+    class FailingDictReader:
+        def __init__(self, handle: Any, delimiter: str) -> None:
+            self._reader = original_dict_reader(handle, delimiter=delimiter)
+            self.fieldnames = self._reader.fieldnames
+            self._index = 0
+
+        def __iter__(self) -> "FailingDictReader":
+            return self
+
+        def __next__(self) -> dict[str, str]:
+            if self._index == 0:
+                self._index += 1
+                return next(self._reader)
+            raise OSError("Invalid argument")
+
+    monkeypatch.setattr(cli.csv, "DictReader", FailingDictReader)
+
+    with caplog.at_level("WARNING", logger=cli.LOGGER.name):
+        rows = list(iter_csv_rows(csv_path, max_bad_lines=10))
+
+    assert [row["enterprise_number"] for row in rows] == ["1", "2", "3", "5", "6"]
+    assert "bad lines skipped: 1" in caplog.messages
+
+
 def test_iter_csv_rows_stops_when_max_bad_lines_exceeded(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     csv_path = tmp_path / "too_many_bad.csv"
     csv_path.write_text(
@@ -435,6 +508,17 @@ def test_iter_csv_rows_falls_back_to_latin_1_encoding(tmp_path: Path) -> None:
     assert rows == [{"enterprise_number": "1", "name": "café"}]
 
 
+def test_iter_csv_rows_detects_latin_1_without_retrying(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    csv_path = tmp_path / "latin1.csv"
+    csv_path.write_bytes("enterprise_number;name\n1;caf\xe9\n".encode("latin-1"))
+
+    with caplog.at_level("WARNING"):
+        rows = list(iter_csv_rows(csv_path, encoding="utf-8-sig"))
+
+    assert rows == [{"enterprise_number": "1", "name": "café"}]
+    assert "Failed reading" not in caplog.text
+
+
 def test_build_records_lite_mode_without_activities_file(tmp_path: Path) -> None:
     (tmp_path / "enterprises.csv").write_text(
         "enterprise_number;name;status;start_date;postal_code;city\n" "0200362210;Beta;ACTIVE;2026-01-01;9400;Ninove\n",
@@ -498,6 +582,26 @@ def test_build_records_limit_applies_after_postcode_and_month_filters(tmp_path:
     assert records[0]["enterprise_number"] == "0200362203"
 
 
+def test_build_records_limit_keeps_highest_scoring_records(tmp_path: Path) -> None:
+    (tmp_path / "enterprises.csv").write_text(
+        "enterprise_number;name;status;start_date;postal_code;city\n"
+        "0200362201;No Nace Co;ACTIVE;2026-01-01;9400;Ninove\n"
+        "0200362202;Horeca Co;ACTIVE;2026-01-01;9400;Ninove\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "establishments.csv").write_text(
+        "enterprise_number;address;postal_code;city\n"
+        "0200362201;First street 1;9400;Ninove\n"
+        "0200362202;Second street 2;9400;Ninove\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "activities.csv").write_text("enterprise_number;nace_code\n" "0200362202;56101\n", encoding="utf-8")
+
+    records = build_records(tmp_path, selected_postcodes={"9400"}, max_months=18, min_score=0, limit=1)
+
+    assert [record["enterprise_number"] for record in records] == ["0200362202"]
+
+
 def test_main_lite_mode_sets_min_score_to_zero(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     input_dir = tmp_path / "raw"
     input_dir.mkdir(parents=True)
@@ -783,6 +887,138 @@ def test_resolve_input_dir_is_idempotent_when_output_dir_exists(
     assert (existing_extracted_dir / "dummy.csv").exists()
 
 
+def test_resolve_input_dir_skips_extraction_for_unchanged_zip(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    args = cli.argparse.Namespace(
+        input=str(tmp_path / "raw"),
+        input_drive_zip="https://drive.google.com/file/d/abc123/view?usp=sharing",
+        download_dir=str(tmp_path / "downloads"),
+    )
+    monkeypatch.setattr(
+        cli, "build_drive_download_url", lambda _: "https://drive.google.com/uc?export=download&id=abc123"
+    )
+
+    source_zip = tmp_path / "source.zip"
+    with zipfile.ZipFile(source_zip, "w") as zip_handle:
+        zip_handle.writestr("dummy.csv", "id;name\n1;alpha\n")
+
+    def fake_download(url: str, destination: Path) -> Path:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(source_zip.read_bytes())
+        return destination
+
+    extract_calls = 0
+    original_extract = cli.extract_zip_file
+
+    def counting_extract(zip_path: Path, output_dir: Path) -> Path:
+        nonlocal extract_calls
+        extract_calls += 1
+        return original_extract(zip_path, output_dir)
+
+    monkeypatch.setattr(cli, "download_file", fake_download)
+    monkeypatch.setattr(cli, "extract_zip_file", counting_extract)
+
+    first = cli.resolve_input_dir(args)
+    second = cli.resolve_input_dir(args)
+
+    assert first == second == tmp_path / "downloads" / "extracted"
+    assert extract_calls == 1
+    assert (second / "dummy.csv").exists()
+
+
+def test_resolve_input_dir_extracts_again_after_failed_extraction(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    args = cli.argparse.Namespace(
+        input=str(tmp_path / "raw"),
+        input_drive_zip="https://drive.google.com/file/d/abc123/view?usp=sharing",
+        download_dir=str(tmp_path / "downloads"),
+    )
+    monkeypatch.setattr(
+        cli, "build_drive_download_url", lambda _: "https://drive.google.com/uc?export=download&id=abc123"
+    )
+
+    zip_a = tmp_path / "a.zip"
+    with zipfile.ZipFile(zip_a, "w") as zip_handle:
+        zip_handle.writestr("dummy.csv", "id;name\n1;alpha\n")
+    zip_b = tmp_path / "b.zip"
+    with zipfile.ZipFile(zip_b, "w") as zip_handle:
+        zip_handle.writestr("dummy.csv", "id;name\n2;bravo\n")
+
+    current_zip = zip_a
+
+    def fake_download(url: str, destination: Path) -> Path:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(current_zip.read_bytes())
+        return destination
+
+    extract_calls = 0
+    fail_extract = False
+    original_extract = cli.extract_zip_file
+
+    def flaky_extract(zip_path: Path, output_dir: Path) -> Path:
+        nonlocal extract_calls
+        extract_calls += 1
+        if fail_extract:
+            raise OSError("disk full")
+        return original_extract(zip_path, output_dir)
+
+    monkeypatch.setattr(cli, "download_file", fake_download)
+    monkeypatch.setattr(cli, "extract_zip_file", flaky_extract)
+
+    cli.resolve_input_dir(args)
+
+    current_zip = zip_b
+    fail_extract = True
+    with pytest.raises(OSError, match="disk full"):
+        cli.resolve_input_dir(args)
+
+    current_zip = zip_a
+    fail_extract = False
+    extracted = cli.resolve_input_dir(args)
+
+    assert extract_calls == 3
+    assert (extracted / cli.EXTRACT_MANIFEST_NAME).is_file()
+
+
+def test_resolve_input_dir_falls_back_when_zip_entry_escapes(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    local_input = tmp_path / "raw"
+    local_input.mkdir()
+    args = cli.argparse.Namespace(
+        input=str(local_input),
+        input_drive_zip="https://drive.google.com/file/d/abc123/view?usp=sharing",
+        download_dir=str(tmp_path / "downloads"),
+    )
+    monkeypatch.setattr(
+        cli, "build_drive_download_url", lambda _: "https://drive.google.com/uc?export=download&id=abc123"
+    )
+
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    extracted_dir = tmp_path / "downloads" / "extracted"
+    extracted_dir.mkdir(parents=True)
+    try:
+        (extracted_dir / "link").symlink_to(outside, target_is_directory=True)
+    except OSError:
+        pytest.skip("symlinks not supported")
+
+    source_zip = tmp_path / "source.zip"
+    with zipfile.ZipFile(source_zip, "w") as zip_handle:
+        zip_handle.writestr("link/enterprise.csv", "id;name\n1;alpha\n")
+
+    def fake_download(url: str, destination: Path) -> Path:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(source_zip.read_bytes())
+        return destination
+
+    monkeypatch.setattr(cli, "download_file", fake_download)
+
+    assert cli.resolve_input_dir(args) == local_input
+    assert "Falling back to --input" in capsys.readouterr().out
+    assert not (outside / "enterprise.csv").exists()
+
+
 def test_months_since_supports_iso_and_kbo_date_formats() -> None:
     iso_months = cli.months_since("1960-08-09")
     kbo_months = cli.months_since("09-08-1960")
@@ -839,3 +1075,128 @@ def test_build_records_postcode_filter_accepts_zipcode_key(monkeypatch: pytest.M
 
     assert len(records) == 1
     assert records[0]["enterprise_number"] == "0123456789"
+
+
+def test_load_activities_by_enterprise_keeps_only_requested_enterprises(tmp_path: Path) -> None:
+    (tmp_path / "activities.csv").write_text(
+        "enterprise_number;nace_code\n" "0200.362.201;96021\n" "0200.362.202;56101\n",
+        encoding="utf-8",
+    )
+
+    activities = cli._load_activities_by_enterprise(tmp_path, enterprise_ids={"0200362202"})
+
+    assert activities == {"0200362202": ["56101"]}
+
+
+def test_iter_csv_rows_normalized_projects_requested_columns(tmp_path: Path) -> None:
+    csv_path = tmp_path / "address.csv"
+    csv_path.write_text(
+        "EntityNumber;TypeOfAddress;Zipcode;StreetNL\n2.123.456.789;BAET;9000;Veldstraat\n",
+        encoding="utf-8",
+    )
+
+    rows = list(cli.iter_csv_rows_normalized(csv_path, keep_column=lambda name: name != "typeofaddress"))
+    assert rows == [{"entitynumber": "2.123.456.789", "postal_code": "9000", "street": "Veldstraat"}]
+
+
+def test_build_records_loads_activities_only_for_candidate_enterprises(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "enterprises.csv").write_text(
+        "enterprise_number;name;status;start_date;postal_code;city\n"
+        "0123456789;Acme;ACTIVE;2026-01-01;9400;Ninove\n"
+        "0123456790;Stopped;ST;2026-01-01;9400;Ninove\n"
+        "0123456791;Old;ACTIVE;2001-01-01;9400;Ninove\n"
+        "0123456792;Elsewhere;ACTIVE;2026-01-01;1000;Brussel\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "establishments.csv").write_text("enterprise_number;address\n", encoding="utf-8")
+    (tmp_path / "activities.csv").write_text("enterprise_number;nace_code\n", encoding="utf-8")
+
+    requested: list[set[str] | None] = []
+    original_loader = cli._load_activities_by_enterprise
+
+    def recording_loader(*args: Any, **kwargs: Any) -> dict[str, list[str]]:
+        requested.append(kwargs.get("enterprise_ids"))
+        return original_loader(*args, **kwargs)
+
+    monkeypatch.setattr(cli, "_load_activities_by_enterprise", recording_loader)
+
+    build_records(tmp_path, selected_postcodes={"9400"}, max_months=18)
+
+    assert requested == [{"0123456789"}]
+
+
+def test_map_enterprise_row_with_resolved_candidates_falls_through_empty_columns() -> None:
+    row = {"enterprise_number": "", "entity_number": "0123.456.789", "denomination": "Acme", "status": "AC"}
+    field_candidates = cli._resolve_field_candidates(row, cli._ENTERPRISE_FIELD_CANDIDATES)
+
+    assert field_candidates["enterprise_number"] == ("enterprise_number", "entity_number")
+    assert field_candidates["website"] == ()
+    mapped = cli._map_enterprise_row(row, field_candidates)
+    assert mapped == cli._map_enterprise_row(row)
+    assert mapped["enterprise_number"] == "0123456789"
+    assert mapped["name"] == "Acme"
+
+
+def test_detect_delimiter_prefers_consistent_column_count(tmp_path: Path) -> None:
+    csv_path = tmp_path / "comma.csv"
+    csv_path.write_text("enterprise_number,name\n1,Acme; Beta\n2,Gamma\n", encoding="utf-8")
+
+    assert cli.detect_delimiter(csv_path) == ","
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        ("name,city;zip\nA,B;1\nC,D;2\n", ","),
+        ("a;b;c,d\n1;2;3,4\n", ","),
+        ("a\tb;c\n1\t2;3\n", "\t"),
+    ],
+)
+def test_detect_delimiter_breaks_ties_like_csv_sniffer(tmp_path: Path, content: str, expected: str) -> None:
+    csv_path = tmp_path / "mixed.csv"
+    csv_path.write_text(content, encoding="utf-8")
+
+    assert cli.detect_delimiter(csv_path) == expected
+
+
+def test_load_denominations_keeps_first_dutch_legal_name(tmp_path: Path) -> None:
+    (tmp_path / "denomination.csv").write_text(
+        "EntityNumber;Denomination;TypeOfDenomination;Language\n"
+        "0207.441.527;Ville de Ninove;001;FR\n"
+        "0207.441.527;Stad Ninove;001;NL\n"
+        "0207.441.527;Gemeente Ninove;001;NL\n",
+        encoding="utf-8",
+    )
+
+    assert cli.load_denominations_by_enterprise(tmp_path) == {"0207441527": "Stad Ninove"}
+
+
+def test_iter_csv_rows_advises_sequential_read_for_large_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    csv_path = tmp_path / "large.csv"
+    csv_path.write_text("enterprise_number;name\n1;Acme\n", encoding="utf-8")
+    advised: list[int] = []
+    monkeypatch.setattr(cli, "LARGE_CSV_WARNING_BYTES", 0)
+    monkeypatch.setattr(
+        cli.os, "posix_fadvise", lambda _fd, _offset, _length, advice: advised.append(advice), raising=False
+    )
+    monkeypatch.setattr(cli.os, "POSIX_FADV_SEQUENTIAL", 2, raising=False)
+
+    rows = list(iter_csv_rows(csv_path))
+
+    assert rows == [{"enterprise_number": "1", "name": "Acme"}]
+    assert advised == [2]
+
+
+def test_build_records_skips_validate_record_when_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    def failing_validate(_record: dict[str, Any]) -> None:
+        raise AssertionError("validate_record should not run")
+
+    monkeypatch.setattr(cli, "validate_record", failing_validate)
+
+    fixture_input = Path(__file__).parent / "fixtures" / "minimal_kbo"
+    records = build_records(fixture_input, selected_postcodes={"9400"}, max_months=18, validate=False)
+
+    assert records
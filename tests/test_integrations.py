@@ -1,5 +1,11 @@
+import io
+import sys
+import types
 from pathlib import Path
 
+import pytest
+
+from src import integrations
 from src.integrations import (
     build_drive_download_url,
     extract_google_drive_file_id,
@@ -39,3 +45,84 @@ def test_extract_zip_file(tmp_path: Path) -> None:
     extracted_file = output / "nested" / "enterprise.csv"
     assert extracted_file.exists()
     assert "Acme" in extracted_file.read_text(encoding="utf-8")
+
+
+def test_extract_zip_file_sanitizes_entries_outside_output_dir(tmp_path: Path) -> None:
+    import zipfile
+
+    zip_path = tmp_path / "evil.zip"
+    with zipfile.ZipFile(zip_path, "w") as zip_handle:
+        zip_handle.writestr("../escaped.csv", "id\n1\n")
+        zip_handle.writestr("/abs/enterprise.csv", "id\n2\n")
+
+    output = tmp_path / "out"
+    extract_zip_file(zip_path, output)
+
+    assert not (tmp_path / "escaped.csv").exists()
+    assert (output / "escaped.csv").read_text(encoding="utf-8") == "id\n1\n"
+    assert (output / "abs" / "enterprise.csv").exists()
+
+
+def test_extract_zip_file_rejects_entries_through_symlinks(tmp_path: Path) -> None:
+    import zipfile
+
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    output = tmp_path / "out"
+    output.mkdir()
+    try:
+        (output / "link").symlink_to(outside, target_is_directory=True)
+    except OSError:
+        pytest.skip("symlinks not supported")
+
+    zip_path = tmp_path / "evil.zip"
+    with zipfile.ZipFile(zip_path, "w") as zip_handle:
+        zip_handle.writestr("link/escaped.csv", "id\n1\n")
+
+    with pytest.raises(integrations.UnsafeZipEntryError, match="escapes output directory"):
+        extract_zip_file(zip_path, output)
+
+    assert not (outside / "escaped.csv").exists()
+
+
+def test_download_file_streams_response_to_destination(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    payload = b"PK" + bytes(range(256)) * 64
+    monkeypatch.setattr(integrations, "urlopen", lambda _request: io.BytesIO(payload))
+
+    destination = integrations.download_file("https://example.com/kbo.zip", tmp_path / "nested" / "kbo.zip")
+
+    assert destination.read_bytes() == payload
+
+
+def test_upload_csv_to_google_sheet_sends_rows_in_batches(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calls: list[tuple[str, object]] = []
+
+    class FakeWorksheet:
+        def clear(self) -> None:
+            calls.append(("clear", None))
+
+        def resize(self, *, rows: int, cols: int) -> None:
+            calls.append(("resize", (rows, cols)))
+
+        def update(self, start: str, values: list[list[str]]) -> None:
+            calls.append((start, len(values)))
+
+    class FakeSpreadsheet:
+        def worksheet(self, _name: str) -> FakeWorksheet:
+            return FakeWorksheet()
+
+    fake_gspread = types.SimpleNamespace(
+        service_account=lambda filename: types.SimpleNamespace(open_by_key=lambda _key: FakeSpreadsheet()),
+        WorksheetNotFound=LookupError,
+    )
+    monkeypatch.setitem(sys.modules, "gspread", fake_gspread)
+    monkeypatch.setenv("GOOGLE_SERVICE_ACCOUNT_JSON", str(tmp_path / "sa.json"))
+    monkeypatch.setattr(integrations, "SHEETS_UPLOAD_BATCH_ROWS", 2)
+    csv_path = tmp_path / "leads.csv"
+    csv_path.write_text("a,b\n1,2\n3,4\n5,6\n", encoding="utf-8")
+
+    integrations.upload_csv_to_google_sheet(
+        sheet_url="https://docs.google.com/spreadsheets/d/abc123/edit", csv_path=csv_path
+    )
+
+    assert calls == [("clear", None), ("resize", (4, 2)), ("A1", 2), ("A3", 2)]
@@ -1,3 +1,7 @@
+from datetime import datetime
+
+import pytest
+
 from src.cli import score_record
 
 
@@ -60,3 +64,52 @@ def test_score_record_has_website_reason_added() -> None:
 
     assert score == 30
     assert "has_website" in reasons.split("|")
+
+
+def test_score_record_clamps_at_zero() -> None:
+    score, reasons = score_record(
+        age_months=None,
+        sector_bucket="other",
+        has_nace=False,
+        has_phone=False,
+        has_email=False,
+        has_website=False,
+        max_months=18,
+    )
+
+    assert score == 0
+    assert reasons == "no_nace"
+
+
+def test_score_leads_scores_columns_without_row_loop() -> None:
+    pd = pytest.importorskip("pandas")
+    from src.scoring import score_leads
+
+    frame = pd.DataFrame(
+        {
+            "start_date": ["2026-01-01", "2000-01-01"],
+            "sector": ["beauty", "retail"],
+            "phone": ["", "+32123"],
+            "email": [None, "a@example.com"],
+            "nace": ["96.02", ""],
+        }
+    )
+
+    scored = score_leads(frame, today=datetime(2026, 6, 1))
+
+    assert scored["score_total"].tolist() == [55, -5]
+    assert scored["score_reasons"].tolist() == [
+        "new<18m;+30|sector;+15|missing_phone;+5|missing_email;+5",
+        "missing_nace;-5",
+    ]
+
+
+def test_score_leads_top_k_returns_best_rows_in_order() -> None:
+    pd = pytest.importorskip("pandas")
+    from src.scoring import score_leads
+
+    frame = pd.DataFrame({"sector": ["retail", "beauty", "retail", "horeca"], "name": ["a", "b", "c", "d"]})
+
+    scored = score_leads(frame, today=datetime(2026, 6, 1), top_k=2)
+
+    assert scored["name"].tolist() == ["b", "d"]
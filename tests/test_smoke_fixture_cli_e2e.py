@@ -1,5 +1,6 @@
 import csv
 from pathlib import Path
+from typing import Any
 
 import pytest
 
@@ -15,70 +16,83 @@ except ModuleNotFoundError:
 
 
 FIXTURE_INPUT = Path(__file__).parent / "fixtures" / "minimal_kbo"
+_FIXTURE_POSTCODES = frozenset({"9400"})
+_ARGV_PREFIX = ("--input", str(FIXTURE_INPUT), "--postcodes", "9400", "--min-score", "0")
+_EXPECTED_FIRST_ROW = {
+    "enterprise_number": "0123456789",
+    "sector_bucket": "beauty",
+    "email": "hello@fixture-salon.example",
+}
 
 
-def test_fixture_smoke_build_records_parses_expected_fields() -> None:
-    records = cli.build_records(FIXTURE_INPUT, selected_postcodes={"9400"}, max_months=18)
+def test_fixture_smoke_build_records_parses_expected_fields(fixture_records: list[dict[str, Any]]) -> None:
+    records = fixture_records
 
     assert len(records) == 1
-    record = records[0]
-    assert record["enterprise_number"] == "0123456789"
-    assert record["name"] == "Fixture Salon"
-    assert record["sector_bucket"] == "beauty"
-    assert record["phone"] == "+32111222333"
-    assert record["email"] == "hello@fixture-salon.example"
-    assert record["status"] == "ACTIVE"
-    assert record["postal_code"] == "9400"
-    assert record["city"] == "Ninove"
-
-
-def test_cli_main_end_to_end_writes_expected_output(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
-    output_file = tmp_path / "out" / "leads.csv"
-
-    monkeypatch.setattr(
-        "sys.argv",
-        [
-            "cli",
-            "--input",
-            str(FIXTURE_INPUT),
-            "--output",
-            str(output_file),
-            "--postcodes",
-            "9400",
-            "--min-score",
-            "0",
-        ],
-    )
+    expected = {
+        "enterprise_number": "0123456789",
+        "name": "Fixture Salon",
+        "sector_bucket": "beauty",
+        "phone": "+32111222333",
+        "email": "hello@fixture-salon.example",
+        "status": "ACTIVE",
+        "postal_code": "9400",
+        "city": "Ninove",
+    }
+    assert {key: records[0][key] for key in expected} == expected
+
+
+def test_cli_main_end_to_end_writes_expected_output(cli_out_dir: Path) -> None:
+    output_file = cli_out_dir / "end_to_end" / "leads.csv"
 
-    cli.main()
+    cli.main([*_ARGV_PREFIX, "--output", str(output_file)])
 
     assert output_file.parent.exists()
     assert output_file.exists()
 
+    with output_file.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        header = next(reader)
+        first_values = next(reader, None)
+
+    assert first_values is not None
+    first = dict(zip(header, first_values))
+    assert {key: first[key] for key in _EXPECTED_FIRST_ROW} == _EXPECTED_FIRST_ROW
+
+
+def test_cli_main_with_validate_writes_expected_output(tmp_path: Path) -> None:
+    output_file = tmp_path / "validated.csv"
+
+    cli.main([*_ARGV_PREFIX, "--output", str(output_file), "--validate"])
+
     with output_file.open("r", encoding="utf-8", newline="") as handle:
         rows = list(csv.DictReader(handle))
 
     assert rows
-    first = rows[0]
-    assert first["enterprise_number"] == "0123456789"
-    assert first["sector_bucket"] == "beauty"
-    assert first["email"] == "hello@fixture-salon.example"
+    assert {key: rows[0][key] for key in _EXPECTED_FIRST_ROW} == _EXPECTED_FIRST_ROW
 
 
-def test_normalize_key_maps_kbo_aliases() -> None:
-    assert cli.normalize_key("Zipcode") == "postal_code"
-    assert cli.normalize_key("MunicipalityNL") == "city"
-    assert cli.normalize_key("MunicipalityFR") == "city_fr"
-    assert cli.normalize_key("StreetNL") == "street"
-    assert cli.normalize_key("HouseNumber") == "house_number"
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("Zipcode", "postal_code"),
+        ("MunicipalityNL", "city"),
+        ("MunicipalityFR", "city_fr"),
+        ("StreetNL", "street"),
+        ("HouseNumber", "house_number"),
+        ("Dénomination", "denomination"),
+    ],
+)
+def test_normalize_key_maps_kbo_aliases(raw: str, expected: str) -> None:
+    assert cli.normalize_key(raw) == expected
 
 
 @pytest.mark.skipif(not HAS_PANDAS, reason="pandas not installed in test environment")
-def test_build_records_fast_matches_default_headers_and_count() -> None:
-    baseline = cli.build_records(FIXTURE_INPUT, selected_postcodes={"9400"}, max_months=18, min_score=0, limit=0)
+def test_build_records_fast_matches_default_headers_and_count(fixture_records: list[dict[str, Any]]) -> None:
+    baseline = fixture_records
     fast = build_records_fast(
         FIXTURE_INPUT,
-        selected_postcodes={"9400"},
+        selected_postcodes=_FIXTURE_POSTCODES,
         max_months=18,
         min_score=0,
         limit=0,
@@ -90,48 +104,13 @@ def test_build_records_fast_matches_default_headers_and_count() -> None:
 
 
 @pytest.mark.skipif(not HAS_PANDAS, reason="pandas not installed in test environment")
-def test_cli_fast_flag_produces_same_header_as_default(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_cli_fast_flag_produces_same_header_as_default(tmp_path: Path) -> None:
     default_output = tmp_path / "default.csv"
     fast_output = tmp_path / "fast.csv"
 
-    monkeypatch.setattr(
-        "sys.argv",
-        [
-            "cli",
-            "--input",
-            str(FIXTURE_INPUT),
-            "--output",
-            str(default_output),
-            "--postcodes",
-            "9400",
-            "--min-score",
-            "0",
-            "--limit",
-            "0",
-        ],
-    )
-    cli.main()
-
-    monkeypatch.setattr(
-        "sys.argv",
-        [
-            "cli",
-            "--input",
-            str(FIXTURE_INPUT),
-            "--output",
-            str(fast_output),
-            "--postcodes",
-            "9400",
-            "--min-score",
-            "0",
-            "--limit",
-            "0",
-            "--fast",
-            "--chunksize",
-            "2",
-        ],
-    )
-    cli.main()
+    cli.main([*_ARGV_PREFIX, "--output", str(default_output), "--limit", "0"])
+
+    cli.main([*_ARGV_PREFIX, "--output", str(fast_output), "--limit", "0", "--fast", "--chunksize", "2"])
 
     with default_output.open("r", encoding="utf-8", newline="") as handle:
         default_rows = list(csv.DictReader(handle))
@@ -147,7 +126,7 @@ def test_cli_fast_flag_produces_same_header_as_default(monkeypatch: pytest.Monke
 def test_build_records_fast_lite_matches_default_count() -> None:
     baseline = cli.build_records(
         FIXTURE_INPUT,
-        selected_postcodes={"9400"},
+        selected_postcodes=_FIXTURE_POSTCODES,
         max_months=18,
         min_score=0,
         limit=0,
@@ -155,7 +134,7 @@ def test_build_records_fast_lite_matches_default_count() -> None:
     )
     fast = build_records_fast(
         FIXTURE_INPUT,
-        selected_postcodes={"9400"},
+        selected_postcodes=_FIXTURE_POSTCODES,
         max_months=18,
         min_score=0,
         limit=0,
@@ -168,11 +147,13 @@ def test_build_records_fast_lite_matches_default_count() -> None:
 
 
 @pytest.mark.skipif(not HAS_PANDAS, reason="pandas not installed in test environment")
-def test_build_records_fast_matches_default_enterprise_set_and_start_date_range() -> None:
-    baseline = cli.build_records(FIXTURE_INPUT, selected_postcodes={"9400"}, max_months=18, min_score=0, limit=0)
+def test_build_records_fast_matches_default_enterprise_set_and_start_date_range(
+    fixture_records: list[dict[str, Any]],
+) -> None:
+    baseline = fixture_records
     fast = build_records_fast(
         FIXTURE_INPUT,
-        selected_postcodes={"9400"},
+        selected_postcodes=_FIXTURE_POSTCODES,
         max_months=18,
         min_score=0,
         limit=0,
@@ -193,28 +174,11 @@ def test_build_records_fast_matches_default_enterprise_set_and_start_date_range(
 
 
 def test_cli_debug_stats_prints_summary(
-    monkeypatch: pytest.MonkeyPatch,
     tmp_path: Path,
     capsys: pytest.CaptureFixture[str],
 ) -> None:
     output_file = tmp_path / "out.csv"
-    monkeypatch.setattr(
-        "sys.argv",
-        [
-            "cli",
-            "--input",
-            str(FIXTURE_INPUT),
-            "--output",
-            str(output_file),
-            "--postcodes",
-            "9400",
-            "--min-score",
-            "0",
-            "--debug-stats",
-        ],
-    )
-
-    cli.main()
+    cli.main([*_ARGV_PREFIX, "--output", str(output_file), "--debug-stats"])
     out = capsys.readouterr().out
 
     assert "Debug stats: total_records=" in out
@@ -222,3 +186,14 @@ def test_cli_debug_stats_prints_summary(
     assert "Debug stats: min_start_date=" in out
     assert "Debug stats: max_start_date=" in out
     assert "Debug stats: sample_enterprise_numbers=" in out
+
+
+@pytest.mark.skipif(not HAS_PANDAS, reason="pandas not installed in test environment")
+def test_normalize_id_column_matches_normalize_id() -> None:
+    import pandas as pd
+
+    from src.fast_pipeline import _normalize_id_column
+
+    raw = ["0123.456.789", " 2.123.456.789 ", '"0200362201"', "BE 0123 456 789", ""]
+
+    assert _normalize_id_column(pd.Series(raw, dtype=str)).tolist() == [cli.normalize_id(value) for value in raw]
@@ -1,4 +1,4 @@
-from src.transform import bucket_from_nace
+from src.transform import bucket_from_nace, ensure_bucket
 
 
 def test_bucket_from_nace_mapping() -> None:
@@ -7,4 +7,13 @@ def test_bucket_from_nace_mapping() -> None:
     assert bucket_from_nace("86210") == "health"
     assert bucket_from_nace("47240") == "retail"
     assert bucket_from_nace("43210") == "service_trades"
+    assert bucket_from_nace("96.09") == "other"
+    assert bucket_from_nace("9") == "other"
     assert bucket_from_nace(None) == "other"
+
+
+def test_ensure_bucket_normalizes_or_falls_back() -> None:
+    assert ensure_bucket("retail") == "retail"
+    assert ensure_bucket(" Horeca ") == "horeca"
+    assert ensure_bucket("unknown") == "other"
+    assert ensure_bucket(None) == "other"
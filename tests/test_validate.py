@@ -0,0 +1,14 @@
+import pytest
+
+from src.validate import validate_record
+
+
+@pytest.mark.parametrize("postal_code", ["9400", " 1000 ", "١٢٣٤", 9400])
+def test_validate_record_accepts_four_digit_postal_codes(postal_code: object) -> None:
+    validate_record({"enterprise_number": "0123456789", "postal_code": postal_code, "score_total": 50})
+
+
+@pytest.mark.parametrize("postal_code", ["940", "94000", "94a0", "²³45", ""])
+def test_validate_record_rejects_other_postal_codes(postal_code: str) -> None:
+    with pytest.raises(AssertionError, match="postal_code"):
+        validate_record({"enterprise_number": "0123456789", "postal_code": postal_code, "score_total": 50})